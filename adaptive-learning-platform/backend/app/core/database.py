@@ -35,6 +35,11 @@ async def close_mongo_connection():
     print("❌ Closed MongoDB connection")
 
 
-def get_database() -> Optional[AsyncIOMotorDatabase]:
-    """Get database instance"""
+async def get_database() -> Optional[AsyncIOMotorDatabase]:
+    """
+    Get database instance
+
+    A coroutine so FastAPI resolves Depends(get_database) inline; plain
+    function dependencies are run through the threadpool on every request.
+    """
     return db.db
@@ -1,6 +1,8 @@
 from datetime import datetime, timedelta
 from typing import Optional
 import jwt
+from bson import ObjectId
+from bson.errors import InvalidId
 from jwt.exceptions import InvalidTokenError
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
@@ -64,3 +66,17 @@ async def get_current_user_id(
         )
 
     return user_id
+
+
+async def get_current_user_oid(
+    user_id: str = Depends(get_current_user_id)
+) -> ObjectId:
+    """Get current user ID as an ObjectId, for collections that store it that way"""
+    try:
+        return ObjectId(user_id)
+    except InvalidId:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
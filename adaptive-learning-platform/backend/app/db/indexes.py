@@ -20,13 +20,18 @@ async def create_indexes(db: AsyncIOMotorDatabase):
     await db.questions.create_index([("document_id", 1), ("topic", 1)])
     await db.questions.create_index([("document_id", 1), ("difficulty", 1)])
     await db.questions.create_index([("topic", 1), ("difficulty", 1)])
+    await db.questions.create_index([("document_id", 1), ("topic", 1), ("difficulty", 1), ("question_type", 1)])
 
     # Test sessions collection
     await db.test_sessions.create_index([("user_id", 1), ("created_at", -1)])
-    await db.test_sessions.create_index([("user_id", 1), ("document_id", 1)])
+    # Serves start_test's in-progress lookup and per-document analytics ordered by
+    # completion; the prefix still serves (user_id, document_id)
+    await db.test_sessions.create_index([("user_id", 1), ("document_id", 1), ("status", 1), ("completed_at", 1)])
     await db.test_sessions.create_index([("document_id", 1), ("status", 1)])
     await db.test_sessions.create_index([("user_id", 1), ("status", 1)])
     await db.test_sessions.create_index([("user_id", 1), ("completed_at", -1)])
+    await db.test_sessions.create_index([("user_id", 1), ("status", 1), ("completed_at", -1)])
+    await db.test_sessions.create_index([("user_id", 1), ("status", 1), ("started_at", -1)])
 
     # Reviews collection
     await db.reviews.create_index([("user_id", 1), ("next_review_date", 1)])
@@ -34,6 +39,9 @@ async def create_indexes(db: AsyncIOMotorDatabase):
     await db.reviews.create_index([("user_id", 1), ("topic", 1)])
     await db.reviews.create_index("question_id")
 
+    # Per-(session, topic) answer stats, written when a test completes
+    await db.session_topic_stats.create_index([("session_id", 1), ("topic", 1)], unique=True)
+
     # Question statistics collection
     await db.question_statistics.create_index("question_id", unique=True)
     await db.question_statistics.create_index([("question_id", 1), ("total_attempts", -1)])
@@ -41,12 +49,16 @@ async def create_indexes(db: AsyncIOMotorDatabase):
     # Study plans collection
     await db.study_plans.create_index([("user_id", 1), ("active", 1)])
     await db.study_plans.create_index([("user_id", 1), ("document_id", 1)])
+    await db.study_plans.create_index([("user_id", 1), ("created_at", -1)])
+
+    # Classrooms collection
+    await db.classrooms.create_index([("teacher_id", 1), ("created_at", -1)])
 
     # Notification history
     await db.notification_history.create_index([("user_id", 1), ("sent_at", -1)])
 
     # API keys
-    await db.api_keys.create_index("key_hash")
+    await db.api_keys.create_index([("key_hash", 1), ("revoked", 1)])
     await db.api_keys.create_index([("user_id", 1), ("revoked", 1)])
 
     print("✓ Database indexes created successfully")
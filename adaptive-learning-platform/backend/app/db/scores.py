@@ -0,0 +1,44 @@
+"""
+Aggregation expressions for test session scores.
+
+Shared by the test routes (stored at completion), the teacher dashboard
+(sessions without a stored score) and the score backfill script.
+"""
+from app.models.test_session import AnswerStatus
+
+
+def answers_where(cond: dict) -> dict:
+    """Aggregation expression: the answers matching cond (answer bound to $$a)"""
+    return {"$filter": {"input": {"$ifNull": ["$answers", []]}, "as": "a", "cond": cond}}
+
+
+def count_status(answer_status: AnswerStatus) -> dict:
+    status_field = {"$ifNull": ["$$a.status", AnswerStatus.NOT_ATTEMPTED.value]}
+    return {"$size": answers_where({"$eq": [status_field, answer_status.value]})}
+
+
+# TestScore fields computed by the server from the session's answers array
+SCORE_EXPRESSION = {
+    "total_questions": {"$size": {"$ifNull": ["$answers", []]}},
+    "correct": count_status(AnswerStatus.CORRECT),
+    "wrong": count_status(AnswerStatus.WRONG),
+    "skipped": count_status(AnswerStatus.SKIPPED),
+    "not_attempted": count_status(AnswerStatus.NOT_ATTEMPTED),
+    "percentage": {"$cond": [
+        {"$gt": [{"$size": {"$ifNull": ["$answers", []]}}, 0]},
+        {"$round": [
+            {"$multiply": [
+                {"$divide": [
+                    count_status(AnswerStatus.CORRECT),
+                    {"$size": "$answers"}
+                ]},
+                100
+            ]},
+            2
+        ]},
+        0
+    ]},
+    "time_spent": {"$sum": "$answers.time_taken"},
+    "marked_tricky_count": {"$size": answers_where({"$eq": ["$$a.marked_tricky", True]})},
+    "marked_review_count": {"$size": answers_where({"$eq": ["$$a.marked_review", True]})}
+}
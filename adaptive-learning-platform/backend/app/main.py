@@ -1,18 +1,21 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from app.core.config import get_settings
 from app.core.database import connect_to_mongo, close_mongo_connection
 from app.core.cache import cache_manager
 from app.routes import auth, documents, questions, tests, analytics, reviews, notifications, comparisons, study_plans, security, question_management, websockets, data_export, teacher, predictions, experiments, session_recording
 from app.core.monitoring import get_metrics
 from app.db.indexes import create_indexes
+from app.services.question_stats_service import question_stats_batcher
 
 settings = get_settings()
 
 app = FastAPI(
     title="Adaptive Learning Platform API",
     description="AI-powered adaptive learning system with exam integrity",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware - Allow cross-origin requests from frontend
@@ -44,18 +47,22 @@ async def startup_event():
 
     # Create database indexes
     try:
-        db = get_database()
+        db = await get_database()
         if db is not None:
             await create_indexes(db)
     except Exception as e:
         print(f"Warning: Could not create indexes: {e}")
 
+    question_stats_batcher.start()
+
     print("🚀 Adaptive Learning Platform API started")
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown"""
+    questions.shutdown_generation_pool()
+    await question_stats_batcher.stop()
     await close_mongo_connection()
     await cache_manager.disconnect()
     print("👋 Adaptive Learning Platform API shutdown")
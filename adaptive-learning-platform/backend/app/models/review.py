@@ -53,7 +53,7 @@ class ReviewSession(BaseModel):
     # Results
     total_reviews: int = 0
     completed_reviews: int = 0
-    average_quality: float = 0.0
+    quality_sum: int = 0  # average quality = quality_sum / completed_reviews
 
 
 class ReviewQueueItem(BaseModel):
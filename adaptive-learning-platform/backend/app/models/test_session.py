@@ -4,6 +4,8 @@ from datetime import datetime
 from bson import ObjectId
 from enum import Enum
 
+from app.models.question import QuestionWithAnswer
+
 
 class PyObjectId(ObjectId):
     @classmethod
@@ -134,3 +136,9 @@ class TestResult(BaseModel):
     tricky_questions: List[str]  # question IDs
     wrong_questions: List[str]  # question IDs
     completed_at: datetime
+
+
+class TestResultSummary(BaseModel):
+    """Results and review questions of a completed test in one response"""
+    results: TestResult
+    review_questions: List[QuestionWithAnswer]
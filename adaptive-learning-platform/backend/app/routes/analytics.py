@@ -142,11 +142,15 @@ async def get_weakness_map(
     # Analyze
     answers = [QuestionAnswer(**a) for a in session["answers"]]
     patterns = AnalyticsService.detect_answer_patterns(answers)
-    topic_mastery = AnalyticsService.calculate_topic_mastery(answers, questions_data)
+    question_lookup = AnalyticsService.build_question_lookup(questions_data)
+    topic_mastery = AnalyticsService.calculate_topic_mastery(
+        answers, questions_data, question_lookup
+    )
     weakness_areas = AnalyticsService.identify_weakness_areas(
         topic_mastery,
         patterns,
-        questions_data
+        questions_data,
+        question_lookup
     )
 
     # Get high priority topics
@@ -195,11 +199,15 @@ async def get_adaptive_targeting(
 
     answers = [QuestionAnswer(**a) for a in session["answers"]]
     patterns = AnalyticsService.detect_answer_patterns(answers)
-    topic_mastery = AnalyticsService.calculate_topic_mastery(answers, questions_data)
+    question_lookup = AnalyticsService.build_question_lookup(questions_data)
+    topic_mastery = AnalyticsService.calculate_topic_mastery(
+        answers, questions_data, question_lookup
+    )
     weakness_areas = AnalyticsService.identify_weakness_areas(
         topic_mastery,
         patterns,
-        questions_data
+        questions_data,
+        question_lookup
     )
 
     adaptive_targeting = AnalyticsService.generate_adaptive_targeting(weakness_areas)
@@ -251,11 +259,15 @@ async def get_smart_review_order(
 
     answers = [QuestionAnswer(**a) for a in session["answers"]]
     patterns = AnalyticsService.detect_answer_patterns(answers)
-    topic_mastery = AnalyticsService.calculate_topic_mastery(answers, questions_data)
+    question_lookup = AnalyticsService.build_question_lookup(questions_data)
+    topic_mastery = AnalyticsService.calculate_topic_mastery(
+        answers, questions_data, question_lookup
+    )
     weakness_areas = AnalyticsService.identify_weakness_areas(
         topic_mastery,
         patterns,
-        questions_data
+        questions_data,
+        question_lookup
     )
 
     review_order = AnalyticsService.smart_review_ordering(
@@ -621,23 +633,36 @@ async def get_aggregate_behavior_fingerprint(
     """
     
     # Get all completed sessions
-    sessions = await db.test_sessions.find({
-        "user_id": ObjectId(user_id),
-        "status": "completed"
-    }).to_list(length=100)
+    sessions = await db.test_sessions.find(
+        {"user_id": ObjectId(user_id), "status": "completed"},
+        {"questions": 1, "answers": 1, "question_data._id": 1,
+         "question_data.topic": 1, "question_data.difficulty": 1}
+    ).to_list(length=100)
     
     if not sessions:
         return AdvancedAnalyticsService._default_fingerprint(user_id)
     
+    # One question lookup shared by every session: embedded payloads first,
+    # then a single query for sessions created before questions were embedded
+    question_lookup = {
+        q["_id"]: q for session in sessions for q in session.get("question_data") or []
+    }
+    missing_ids = {
+        q_id for session in sessions for q_id in session["questions"]
+        if q_id not in question_lookup
+    }
+    if missing_ids:
+        cursor = db.questions.find(
+            {"_id": {"$in": [ObjectId(q_id) for q_id in missing_ids]}},
+            {"topic": 1, "difficulty": 1}
+        )
+        async for question in cursor:
+            question_lookup[str(question["_id"])] = question
+    
     # Collect all signals across all sessions
     all_signals = []
     
     for session in sessions:
-        question_ids = [ObjectId(q_id) for q_id in session["questions"]]
-        cursor = db.questions.find({"_id": {"$in": question_ids}})
-        questions_data = await cursor.to_list(length=1000)
-        question_lookup = {str(q["_id"]): q for q in questions_data}
-        
         for answer in session["answers"]:
             question = question_lookup.get(answer["question_id"])
             if question:
@@ -68,5 +68,7 @@ async def get_audit_log(
     """Get user's audit log (data exports and deletions)."""
     cursor = db.data_exports.find({"user_id": user_id}).sort("exported_at", -1).limit(limit)
     logs = await cursor.to_list(length=limit)
+    for log in logs:
+        log["_id"] = str(log["_id"])
 
     return {"audit_log": logs, "total": len(logs)}
@@ -25,7 +25,7 @@ async def process_document_background(document_id: str, file_path: str, file_typ
     """Background task to process uploaded document"""
     from app.core.database import get_database
 
-    db = get_database()
+    db = await get_database()
     processor = DocumentProcessor()
 
     try:
@@ -36,3 +36,4 @@ async def fix_question_tracking_fields(db=Depends(get_database)):
         "questions_updated": result.modified_count,
         "message": f"Added tracking fields to {result.modified_count} existing questions"
     }
+
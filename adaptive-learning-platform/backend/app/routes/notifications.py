@@ -24,6 +24,7 @@ async def get_notification_preferences(
         # Return defaults
         return NotificationPreference(user_id=user_id).dict()
 
+    prefs["_id"] = str(prefs["_id"])
     return prefs
 
 
@@ -91,6 +92,8 @@ async def get_notification_history(
     ).sort("sent_at", -1).limit(limit)
 
     history = await cursor.to_list(length=limit)
+    for entry in history:
+        entry["_id"] = str(entry["_id"])
 
     return {
         "history": history,
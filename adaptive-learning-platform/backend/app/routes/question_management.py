@@ -2,6 +2,7 @@
 Question bank management routes.
 """
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi.responses import StreamingResponse
 from typing import List
 import json
 import csv
@@ -94,29 +95,35 @@ async def export_questions(
     db=Depends(get_database)
 ):
     """Export questions for a document."""
+    if format == "csv":
+        return StreamingResponse(
+            _stream_questions_csv(db, document_id),
+            media_type="text/csv",
+            headers={"Content-Disposition": f"attachment; filename=questions-{document_id}.csv"}
+        )
+
     questions = await QuestionSimilarityService.export_questions(
         db=db,
         document_id=document_id
     )
 
-    if format == "csv":
-        # Convert to CSV
-        if not questions:
-            return {"questions": [], "format": "csv"}
-
-        output = io.StringIO()
-        fieldnames = questions[0].keys()
-        writer = csv.DictWriter(output, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(questions)
-
-        return {
-            "data": output.getvalue(),
-            "format": "csv"
-        }
-
     return {
         "questions": questions,
         "count": len(questions),
         "format": "json"
     }
+
+
+async def _stream_questions_csv(db, document_id: str):
+    """Yield CSV chunks row by row as questions are read from Mongo."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=QuestionSimilarityService.EXPORT_FIELDS)
+
+    writer.writeheader()
+    yield buffer.getvalue()
+
+    async for row in QuestionSimilarityService.iter_export_questions(db, document_id):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(row)
+        yield buffer.getvalue()
@@ -1,8 +1,13 @@
-from fastapi import APIRouter, HTTPException, status, Depends, BackgroundTasks
-from typing import List
+from fastapi import APIRouter, HTTPException, status, Depends
+from typing import List, Optional
 from bson import ObjectId
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
+import functools
+import multiprocessing
 import random
+import traceback
 
 from app.core.database import get_database
 from app.core.security import get_current_user_id
@@ -16,9 +21,40 @@ from app.models.question import (
 )
 from app.services.llm_service import LLMService
 from app.services.question_selection_service import QuestionSelectionService
+from app.services.question_similarity_service import QuestionSimilarityService
+from app.utils.answers import normalize_answer
 
 router = APIRouter()
 
+# Fields needed to build a QuestionResponse
+QUESTION_RESPONSE_PROJECTION = {
+    "question_text": 1,
+    "question_type": 1,
+    "difficulty": 1,
+    "topic": 1,
+    "section_title": 1,
+    "options.text": 1
+}
+
+
+def _question_response(q: dict) -> QuestionResponse:
+    """
+    Build a QuestionResponse from a trusted Mongo document.
+
+    Uses model_construct to skip per-field validation; only the option
+    text is exposed so is_correct/explanation stay hidden.
+    """
+    options = q.get("options")
+    return QuestionResponse.model_construct(
+        _id=str(q["_id"]),
+        question_text=q["question_text"],
+        question_type=q["question_type"],
+        difficulty=q["difficulty"],
+        topic=q["topic"],
+        section_title=q.get("section_title"),
+        options=[{"text": opt["text"]} for opt in options] if options else None
+    )
+
 
 async def generate_questions_background(
     document_id: str,
@@ -31,7 +67,7 @@ async def generate_questions_background(
     """Background task to generate questions"""
     from app.core.database import get_database
 
-    db = get_database()
+    db = await get_database()
     llm_service = LLMService()
 
     try:
@@ -62,26 +98,34 @@ async def generate_questions_background(
 
         generated_questions = []
 
+        # Near-duplicate index over questions already stored for this document
+        lsh = await QuestionSimilarityService.build_minhash_index(db, document_id)
+        attempts = 0
+        max_attempts = num_questions * 3
+
+        # Expand the requested distribution into a shuffled difficulty plan once;
+        # a difficulty leaves the plan only when a question for it is saved
+        difficulty_plan = None
+        if difficulty_distribution:
+            difficulty_plan = [
+                d for d, count in difficulty_distribution.items() for _ in range(count)
+            ]
+            random.shuffle(difficulty_plan)
+
         # Keep generating until we have enough questions
-        while len(generated_questions) < num_questions:
+        while len(generated_questions) < num_questions and attempts < max_attempts:
             # Cycle through sections if we need more questions than sections
             for section in sections:
-                if len(generated_questions) >= num_questions:
+                if len(generated_questions) >= num_questions or attempts >= max_attempts:
                     break
+                attempts += 1
 
                 section_context = section.get("content", "")
                 section_topic = section.get("title", "General")
 
                 # Determine difficulty for this question
-                if difficulty_distribution:
-                    available_difficulties = [
-                        k for k, v in difficulty_distribution.items() if v > 0
-                    ]
-                    if available_difficulties:
-                        difficulty = random.choice(available_difficulties)
-                        difficulty_distribution[difficulty] -= 1
-                    else:
-                        difficulty = "medium"
+                if difficulty_plan is not None:
+                    difficulty = difficulty_plan[-1] if difficulty_plan else "medium"
                 else:
                     difficulty = random.choice(["easy", "medium", "hard", "tricky"])
 
@@ -103,6 +147,12 @@ async def generate_questions_background(
                     print(f"[Question Gen] LLM returned {len(questions)} questions")
 
                     for q in questions:
+                        # Skip near-duplicates of existing questions; the loop regenerates
+                        signature = QuestionSimilarityService.minhash_signature(q["question_text"])
+                        if lsh.is_duplicate(signature):
+                            print(f"[Question Gen] Skipping duplicate question for section: {section_topic}")
+                            continue
+
                         # Ensure question_type is stored as string value, not enum
                         q_type = q["question_type"]
                         if hasattr(q_type, 'value'):
@@ -121,8 +171,10 @@ async def generate_questions_background(
                             "section_title": section.get("title"),
                             "options": q.get("options", []),
                             "correct_answer": q["correct_answer"],
+                            "normalized_answer": normalize_answer(q["correct_answer"]),
                             "explanation": q["explanation"],
                             "source_context": q.get("source_context", section_context[:500]),
+                            "minhash": signature,
                             "created_at": datetime.utcnow(),
                             # Question reuse tracking fields
                             "times_answered": 0,
@@ -132,7 +184,10 @@ async def generate_questions_background(
                         }
 
                         result = await db.questions.insert_one(question_doc)
+                        lsh.insert(signature)
                         generated_questions.append(str(result.inserted_id))
+                        if difficulty_plan:
+                            difficulty_plan.pop()
                         print(f"[Question Gen] Saved question {len(generated_questions)}/{num_questions}")
 
                         if len(generated_questions) >= num_questions:
@@ -154,20 +209,96 @@ async def generate_questions_background(
         await llm_service.close()
 
 
+# Question generation runs in worker processes so LLM response parsing and
+# validation never block the API event loop.
+GENERATION_WORKERS = 2
+_generation_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _run_generation_job(*args):
+    """Process pool entry point: run generation with its own loop and Mongo client"""
+    from app.core.database import connect_to_mongo, close_mongo_connection
+
+    async def run():
+        await connect_to_mongo()
+        try:
+            await generate_questions_background(*args)
+        finally:
+            await close_mongo_connection()
+
+    asyncio.run(run())
+
+
+def submit_question_generation(
+    document_id: str,
+    user_id: str,
+    num_questions: int,
+    difficulty_distribution: Optional[dict],
+    topics: List[str],
+    question_types: List[QuestionType]
+):
+    """Queue a question generation job on the generation process pool"""
+    global _generation_pool
+
+    if _generation_pool is None:
+        _generation_pool = ProcessPoolExecutor(
+            max_workers=GENERATION_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+
+    future = asyncio.get_running_loop().run_in_executor(
+        _generation_pool,
+        _run_generation_job,
+        document_id,
+        user_id,
+        num_questions,
+        difficulty_distribution,
+        topics,
+        question_types
+    )
+    future.add_done_callback(functools.partial(_on_generation_done, document_id))
+    return future
+
+
+def _on_generation_done(document_id: str, future: asyncio.Future):
+    """
+    Log a generation job that failed outside generate_questions_background
+    (which logs its own errors), e.g. a worker that could not start
+    """
+    if future.cancelled():
+        return
+
+    error = future.exception()
+    if error is not None:
+        print(f"[Question Gen] FATAL ERROR in worker for document {document_id}: {error!r}")
+        traceback.print_exception(type(error), error, error.__traceback__)
+
+
+def shutdown_generation_pool():
+    """Stop the generation process pool (called on app shutdown)"""
+    global _generation_pool
+
+    if _generation_pool is not None:
+        _generation_pool.shutdown(wait=False, cancel_futures=True)
+        _generation_pool = None
+
+
 @router.post("/generate", response_model=GenerateQuestionsResponse)
 async def generate_questions(
     request: GenerateQuestionsRequest,
-    background_tasks: BackgroundTasks,
     user_id: str = Depends(get_current_user_id),
     db=Depends(get_database)
 ):
     """Generate questions from a document"""
 
     # Verify document exists and belongs to user
-    document = await db.documents.find_one({
-        "_id": ObjectId(request.document_id),
-        "user_id": ObjectId(user_id)
-    })
+    document = await db.documents.find_one(
+        {
+            "_id": ObjectId(request.document_id),
+            "user_id": ObjectId(user_id)
+        },
+        {"processing_status": 1}
+    )
 
     if not document:
         raise HTTPException(
@@ -181,9 +312,8 @@ async def generate_questions(
             detail="Document is still processing"
         )
 
-    # Start background generation
-    background_tasks.add_task(
-        generate_questions_background,
+    # Start generation in a worker process
+    submit_question_generation(
         request.document_id,
         user_id,
         request.num_questions,
@@ -208,10 +338,13 @@ async def get_questions_for_document(
     """Get all questions for a document"""
 
     # Verify document belongs to user
-    document = await db.documents.find_one({
-        "_id": ObjectId(document_id),
-        "user_id": ObjectId(user_id)
-    })
+    document = await db.documents.find_one(
+        {
+            "_id": ObjectId(document_id),
+            "user_id": ObjectId(user_id)
+        },
+        {"_id": 1}
+    )
 
     if not document:
         raise HTTPException(
@@ -220,24 +353,13 @@ async def get_questions_for_document(
         )
 
     # Get questions
-    cursor = db.questions.find({"document_id": ObjectId(document_id)})
+    cursor = db.questions.find(
+        {"document_id": ObjectId(document_id)},
+        QUESTION_RESPONSE_PROJECTION
+    )
     questions = await cursor.to_list(length=1000)
 
-    return [
-        QuestionResponse(
-            _id=str(q["_id"]),
-            question_text=q["question_text"],
-            question_type=q["question_type"],
-            difficulty=q["difficulty"],
-            topic=q["topic"],
-            section_title=q.get("section_title"),
-            options=[
-                {"text": opt["text"]}
-                for opt in q.get("options", [])
-            ] if q.get("options") else None
-        )
-        for q in questions
-    ]
+    return [_question_response(q) for q in questions]
 
 
 @router.get("/{question_id}", response_model=QuestionResponse)
@@ -248,10 +370,13 @@ async def get_question(
 ):
     """Get a specific question (without answer)"""
 
-    question = await db.questions.find_one({
-        "_id": ObjectId(question_id),
-        "user_id": ObjectId(user_id)
-    })
+    question = await db.questions.find_one(
+        {
+            "_id": ObjectId(question_id),
+            "user_id": ObjectId(user_id)
+        },
+        QUESTION_RESPONSE_PROJECTION
+    )
 
     if not question:
         raise HTTPException(
@@ -259,18 +384,7 @@ async def get_question(
             detail="Question not found"
         )
 
-    return QuestionResponse(
-        _id=str(question["_id"]),
-        question_text=question["question_text"],
-        question_type=question["question_type"],
-        difficulty=question["difficulty"],
-        topic=question["topic"],
-        section_title=question.get("section_title"),
-        options=[
-            {"text": opt["text"]}
-            for opt in question.get("options", [])
-        ] if question.get("options") else None
-    )
+    return _question_response(question)
 
 
 @router.delete("/{question_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -7,7 +7,7 @@ from bson import ObjectId
 
 from app.core.database import get_database
 from app.core.security import get_current_user_id
-from app.models.review import ReviewResponse, ReviewSession
+from app.models.review import ReviewResponse
 from app.services.spaced_repetition_service import SpacedRepetitionService
 
 router = APIRouter()
@@ -42,34 +42,23 @@ async def create_review_session(
     db=Depends(get_database)
 ):
     """Create a new review session from due reviews."""
-    # Get due reviews
-    queue = await SpacedRepetitionService.get_due_reviews(
+    session = await SpacedRepetitionService.create_review_session(
         db=db,
         user_id=user_id,
         document_id=document_id,
-        limit=max_reviews
+        max_reviews=max_reviews
     )
 
-    if not queue:
+    if not session:
         return {
             "message": "No reviews due at this time",
             "session": None
         }
 
-    # Create session
-    session = ReviewSession(
-        user_id=user_id,
-        document_id=document_id,
-        review_ids=[item.review_id for item in queue],
-        total_reviews=len(queue)
-    )
-
-    result = await db.review_sessions.insert_one(session.dict())
-
     return {
-        "session_id": str(result.inserted_id),
-        "total_reviews": len(queue),
-        "reviews": queue
+        "session_id": str(session["_id"]),
+        "total_reviews": session["total_reviews"],
+        "review_ids": session["review_ids"]
     }
 
 
@@ -111,7 +100,7 @@ async def get_review_session(
 
     # Convert ObjectId to str for JSON serialization
     session["_id"] = str(session["_id"])
-    session["reviews"] = [{**r, "_id": str(r["_id"]), "question_id": str(r["question_id"]), "question": {**r["question"], "_id": str(r["question"]["_id"])}} for r in full_reviews]
+    session["reviews"] = [{**r, "_id": str(r["_id"]), "question_id": str(r["question_id"]), "question": {**r["question"], "_id": str(r["question"]["_id"]), "document_id": str(r["question"]["document_id"])}} for r in full_reviews]
 
     return session
 
@@ -144,18 +133,23 @@ async def submit_review_response(
         response=response
     )
 
-    # Update session progress
+    # Update session progress (mean quality is derived at read time).
+    # Sessions from before quality_sum stored only the running average.
     await db.review_sessions.update_one(
         {"_id": ObjectId(session_id)},
-        {
-            "$inc": {"completed_reviews": 1},
-            "$set": {
-                "average_quality": (
-                    session.get("average_quality", 0) * session.get("completed_reviews", 0) +
-                    response.quality
-                ) / (session.get("completed_reviews", 0) + 1)
-            }
-        }
+        [{"$set": {
+            "completed_reviews": {"$add": [{"$ifNull": ["$completed_reviews", 0]}, 1]},
+            "quality_sum": {"$add": [
+                {"$ifNull": [
+                    "$quality_sum",
+                    {"$round": [{"$multiply": [
+                        {"$ifNull": ["$average_quality", 0]},
+                        {"$ifNull": ["$completed_reviews", 0]}
+                    ]}]}
+                ]},
+                response.quality
+            ]}
+        }}]
     )
 
     return {
@@ -189,11 +183,16 @@ async def complete_review_session(
         {"$set": {"completed_at": datetime.utcnow()}}
     )
 
+    completed_reviews = session.get("completed_reviews", 0)
+    quality_sum = session.get("quality_sum")
+    if quality_sum is None:
+        quality_sum = round(session.get("average_quality", 0) * completed_reviews)
+
     return {
         "session_id": session_id,
-        "completed_reviews": session.get("completed_reviews", 0),
+        "completed_reviews": completed_reviews,
         "total_reviews": session.get("total_reviews", 0),
-        "average_quality": session.get("average_quality", 0),
+        "average_quality": quality_sum / max(completed_reviews, 1),
         "message": "Review session completed"
     }
 
@@ -103,15 +103,15 @@ async def verify_2fa(
     db=Depends(get_database)
 ):
     """Verify a 2FA token."""
-    tfa = await db.two_factor_auth.find_one({"user_id": user_id, "enabled": True})
+    secret = await SecurityService.get_2fa_secret(db=db, user_id=user_id)
 
-    if not tfa:
+    if not secret:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="2FA not enabled"
         )
 
-    valid = SecurityService.verify_2fa_token(tfa["secret"], request.token)
+    valid = SecurityService.verify_2fa_token(secret, request.token)
 
     return {"valid": valid}
 
@@ -144,12 +144,14 @@ async def list_api_keys(
     db=Depends(get_database)
 ):
     """List all API keys for the user."""
-    cursor = db.api_keys.find({"user_id": user_id, "revoked": False})
+    # Never read the key hash back out of the database
+    cursor = db.api_keys.find(
+        {"user_id": user_id, "revoked": False},
+        {"key_hash": 0}
+    )
     keys = await cursor.to_list(length=100)
-
-    # Remove sensitive data
     for key in keys:
-        key.pop("key_hash", None)
+        key["_id"] = str(key["_id"])
 
     return {"api_keys": keys}
 
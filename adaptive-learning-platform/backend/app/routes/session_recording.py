@@ -8,6 +8,7 @@ from typing import List
 from app.core.database import get_database
 from app.core.security import get_current_user_id
 from app.models.interaction import InteractionEvent
+from app.utils.streaming import stream_json_list_response
 
 router = APIRouter()
 
@@ -28,6 +29,9 @@ async def log_interaction_event(
     return {"message": "Event logged"}
 
 
+REPLAY_BATCH_SIZE = 1000
+
+
 @router.get("/{session_id}/replay")
 async def get_session_replay_data(
     session_id: str,
@@ -36,10 +40,10 @@ async def get_session_replay_data(
 ):
     """Get all interaction events for session replay."""
     # Verify session ownership
-    session = await db.test_sessions.find_one({
-        "_id": ObjectId(session_id),
-        "user_id": user_id
-    })
+    session = await db.test_sessions.find_one(
+        {"_id": ObjectId(session_id), "user_id": user_id},
+        {"_id": 1}
+    )
 
     if not session:
         return {"message": "Session not found"}
@@ -47,15 +51,11 @@ async def get_session_replay_data(
     # Get all events
     cursor = db.interaction_events.find({
         "session_id": session_id
-    }).sort("timestamp", 1)
-
-    events = await cursor.to_list(length=100000)
+    }).sort("timestamp", 1).batch_size(REPLAY_BATCH_SIZE)
 
-    return {
-        "session_id": session_id,
-        "events": events,
-        "total_events": len(events)
-    }
+    return await stream_json_list_response(
+        {"session_id": session_id}, "events", cursor, "total_events"
+    )
 
 
 @router.get("/{session_id}/timeline")
@@ -68,12 +68,8 @@ async def get_answer_change_timeline(
     cursor = db.interaction_events.find({
         "session_id": session_id,
         "event_type": "answer_change"
-    }).sort("timestamp", 1)
-
-    events = await cursor.to_list(length=10000)
+    }).sort("timestamp", 1).limit(10000).batch_size(REPLAY_BATCH_SIZE)
 
-    return {
-        "session_id": session_id,
-        "timeline": events,
-        "total_changes": len(events)
-    }
+    return await stream_json_list_response(
+        {"session_id": session_id}, "timeline", cursor, "total_changes"
+    )
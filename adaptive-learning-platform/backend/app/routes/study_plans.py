@@ -8,9 +8,23 @@ from app.core.database import get_database
 from app.core.security import get_current_user_id
 from app.models.study_plan import CreateStudyPlanRequest
 from app.services.study_planner_service import StudyPlannerService
+from app.utils.streaming import stream_json_list_response
 
 router = APIRouter()
 
+# Fields shown in the study plan list view
+STUDY_PLAN_LIST_PROJECTION = {
+    "document_id": 1,
+    "title": 1,
+    "description": 1,
+    "goal_type": 1,
+    "target_date": 1,
+    "total_sessions": 1,
+    "completed_sessions": 1,
+    "active": 1,
+    "created_at": 1
+}
+
 
 @router.post("/generate")
 async def generate_study_plan(
@@ -53,6 +67,7 @@ async def get_study_plan(
             detail="Study plan not found"
         )
 
+    plan["_id"] = str(plan["_id"])
     return plan
 
 
@@ -63,19 +78,19 @@ async def get_next_session(
     db=Depends(get_database)
 ):
     """Get the next recommended session."""
-    # Verify ownership
-    plan = await db.study_plans.find_one({
-        "_id": ObjectId(plan_id),
-        "user_id": user_id
-    })
+    next_session = await StudyPlannerService.get_next_session(
+        db=db,
+        plan_id=plan_id,
+        user_id=user_id
+    )
 
-    if not plan:
+    if next_session is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Study plan not found"
         )
 
-    return await StudyPlannerService.get_next_session(db=db, plan_id=plan_id)
+    return next_session
 
 
 @router.post("/{plan_id}/complete-session/{session_number}")
@@ -86,24 +101,19 @@ async def complete_session(
     db=Depends(get_database)
 ):
     """Mark a session as completed."""
-    # Verify ownership
-    plan = await db.study_plans.find_one({
-        "_id": ObjectId(plan_id),
-        "user_id": user_id
-    })
+    completed = await StudyPlannerService.complete_session(
+        db=db,
+        plan_id=plan_id,
+        session_number=session_number,
+        user_id=user_id
+    )
 
-    if not plan:
+    if not completed:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Study plan not found"
         )
 
-    await StudyPlannerService.complete_session(
-        db=db,
-        plan_id=plan_id,
-        session_number=session_number
-    )
-
     return {"message": "Session marked as completed"}
 
 
@@ -114,19 +124,19 @@ async def get_plan_progress(
     db=Depends(get_database)
 ):
     """Get study plan progress."""
-    # Verify ownership
-    plan = await db.study_plans.find_one({
-        "_id": ObjectId(plan_id),
-        "user_id": user_id
-    })
+    progress = await StudyPlannerService.get_progress(
+        db=db,
+        plan_id=plan_id,
+        user_id=user_id
+    )
 
-    if not plan:
+    if progress is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Study plan not found"
         )
 
-    return await StudyPlannerService.get_progress(db=db, plan_id=plan_id)
+    return progress
 
 
 @router.get("/")
@@ -135,7 +145,10 @@ async def list_study_plans(
     db=Depends(get_database)
 ):
     """List all study plans for the user."""
-    cursor = db.study_plans.find({"user_id": user_id}).sort("created_at", -1)
-    plans = await cursor.to_list(length=100)
+    # Served by the (user_id, created_at) index; the session schedule stays out
+    cursor = db.study_plans.find(
+        {"user_id": user_id},
+        STUDY_PLAN_LIST_PROJECTION
+    ).sort("created_at", -1).limit(100)
 
-    return {"plans": plans, "total": len(plans)}
+    return await stream_json_list_response({}, "plans", cursor, "total")
@@ -4,14 +4,25 @@ Teacher dashboard routes.
 from fastapi import APIRouter, Depends, HTTPException, status
 from bson import ObjectId
 from datetime import datetime, timedelta
+from typing import List
 
 from app.core.database import get_database
 from app.core.security import get_current_user_id
+from app.db.scores import SCORE_EXPRESSION
 from app.models.classroom import Classroom, Assignment
 
 router = APIRouter()
 
 
+def _session_user_ids(student_ids: List[str]) -> List[ObjectId]:
+    """Classrooms keep student ids as strings; test sessions store ObjectIds."""
+    return [ObjectId(s) for s in student_ids if ObjectId.is_valid(s)]
+
+
+# Stored score percentage, computed from the answers for sessions without one
+SCORE_PERCENTAGE = {"$ifNull": ["$score.percentage", SCORE_EXPRESSION["percentage"]]}
+
+
 @router.post("/classrooms")
 async def create_classroom(
     classroom: Classroom,
@@ -34,8 +45,13 @@ async def list_classrooms(
     db=Depends(get_database)
 ):
     """List all classrooms for a teacher."""
-    cursor = db.classrooms.find({"teacher_id": user_id})
+    cursor = db.classrooms.find(
+        {"teacher_id": user_id},
+        {"name": 1, "description": 1, "students": 1, "active": 1, "created_at": 1}
+    ).sort("created_at", -1)
     classrooms = await cursor.to_list(length=100)
+    for classroom in classrooms:
+        classroom["_id"] = str(classroom["_id"])
 
     return {"classrooms": classrooms}
 
@@ -48,19 +64,14 @@ async def add_student_to_classroom(
     db=Depends(get_database)
 ):
     """Add a student to a classroom."""
-    classroom = await db.classrooms.find_one({
-        "_id": ObjectId(classroom_id),
-        "teacher_id": user_id
-    })
-
-    if not classroom:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Classroom not found")
-
-    await db.classrooms.update_one(
-        {"_id": ObjectId(classroom_id)},
+    result = await db.classrooms.update_one(
+        {"_id": ObjectId(classroom_id), "teacher_id": user_id},
         {"$addToSet": {"students": student_id}}
     )
 
+    if result.matched_count == 0:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Classroom not found")
+
     return {"message": "Student added to classroom"}
 
 
@@ -79,36 +90,54 @@ async def get_classroom_analytics(
     if not classroom:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Classroom not found")
 
-    # Get all sessions from students
+    # Aggregate completed sessions per student and overall on the server
     student_ids = classroom.get("students", [])
-    sessions = await db.test_sessions.find({
-        "user_id": {"$in": student_ids},
-        "status": "completed"
-    }).to_list(length=10000)
 
-    if not sessions:
+    result = await db.test_sessions.aggregate([
+        {"$match": {
+            "user_id": {"$in": _session_user_ids(student_ids)},
+            "status": "completed"
+        }},
+        # Only carry what the groups read
+        {"$project": {"_id": 0, "user_id": 1, "score": SCORE_PERCENTAGE, "completed_at": 1}},
+        {"$facet": {
+            "overall": [
+                {"$group": {
+                    "_id": None,
+                    "total_sessions": {"$sum": 1},
+                    "average_score": {"$avg": "$score"}
+                }}
+            ],
+            "per_student": [
+                {"$group": {
+                    "_id": "$user_id",
+                    "sessions_completed": {"$sum": 1},
+                    "average_score": {"$avg": "$score"},
+                    "last_activity": {"$max": "$completed_at"}
+                }}
+            ]
+        }}
+    ]).to_list(length=1)
+
+    overall = result[0]["overall"] if result else []
+    if not overall:
         return {"message": "No data yet"}
 
-    # Calculate aggregates
-    total_sessions = len(sessions)
-    avg_score = sum(s.get("score", 0) for s in sessions) / total_sessions
-
     # Per-student stats
-    student_stats = {}
-    for student_id in student_ids:
-        student_sessions = [s for s in sessions if str(s.get("user_id")) == student_id]
-        if student_sessions:
-            student_stats[student_id] = {
-                "sessions_completed": len(student_sessions),
-                "average_score": sum(s.get("score", 0) for s in student_sessions) / len(student_sessions),
-                "last_activity": max(s.get("completed_at") for s in student_sessions if s.get("completed_at"))
-            }
+    student_stats = {
+        str(row["_id"]): {
+            "sessions_completed": row["sessions_completed"],
+            "average_score": row["average_score"],
+            "last_activity": row["last_activity"]
+        }
+        for row in result[0]["per_student"]
+    }
 
     return {
         "classroom_id": classroom_id,
         "total_students": len(student_ids),
-        "total_sessions": total_sessions,
-        "average_score": round(avg_score, 1),
+        "total_sessions": overall[0]["total_sessions"],
+        "average_score": round(overall[0]["average_score"], 1),
         "student_stats": student_stats
     }
 
@@ -131,19 +160,29 @@ async def get_student_alerts(
     alerts = []
     student_ids = classroom.get("students", [])
 
-    for student_id in student_ids:
-        # Get recent sessions
-        week_ago = datetime.utcnow() - timedelta(days=7)
-        recent_sessions = await db.test_sessions.find({
-            "user_id": student_id,
-            "completed_at": {"$gte": week_ago},
+    # Average recent scores for all students in one query
+    now = datetime.utcnow()
+    week_ago = now - timedelta(days=7)
+    recent = await db.test_sessions.aggregate([
+        {"$match": {
+            "user_id": {"$in": _session_user_ids(student_ids)},
+            "completed_at": {"$gte": week_ago, "$lt": now},
             "status": "completed"
-        }).to_list(length=100)
+        }},
+        {"$project": {"_id": 0, "user_id": 1, "score": SCORE_PERCENTAGE}},
+        {"$group": {
+            "_id": "$user_id",
+            "avg_score": {"$avg": "$score"}
+        }}
+    ]).to_list(length=None)
 
-        # Check for low scores
-        if recent_sessions:
-            avg_score = sum(s.get("score", 0) for s in recent_sessions) / len(recent_sessions)
+    recent_averages = {str(row["_id"]): row["avg_score"] for row in recent}
 
+    for student_id in student_ids:
+        avg_score = recent_averages.get(student_id)
+
+        # Check for low scores
+        if avg_score is not None:
             if avg_score < 50:
                 alerts.append({
                     "student_id": student_id,
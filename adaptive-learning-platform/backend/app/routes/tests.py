@@ -1,67 +1,370 @@
 from fastapi import APIRouter, HTTPException, status, Depends
 from typing import List
 from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import ReturnDocument
 from datetime import datetime
-import random
+import asyncio
 
 from app.core.database import get_database
-from app.core.security import get_current_user_id
+from app.core.security import get_current_user_id, get_current_user_oid
+from app.db.scores import SCORE_EXPRESSION, answers_where
 from app.models.test_session import (
+    TestConfig,
     TestSessionCreate,
     TestSessionResponse,
     TestStatus,
     SubmitAnswerRequest,
     SubmitAnswerResponse,
     MarkQuestionRequest,
-    TestResult,
-    TestScore,
     QuestionAnswer,
+    TestResult,
+    TestResultSummary,
     AnswerStatus
 )
 from app.models.question import QuestionResponse, QuestionWithAnswer
-from app.services.question_stats_service import QuestionStatsService
+from app.services.advanced_analytics_service import AdvancedAnalyticsService
+from app.services.question_stats_service import question_stats_batcher
 from app.services.question_selection_service import QuestionSelectionService
+from app.utils.answers import normalize_answer
+from app.utils.responses import MongoJSONResponse
 
 router = APIRouter()
 
+# Fields needed to build a TestSessionResponse
+SESSION_SUMMARY_PROJECTION = {
+    "document_id": 1,
+    "config": 1,
+    "current_question_index": 1,
+    "questions": 1,
+    "status": 1,
+    "started_at": 1,
+    "completed_at": 1
+}
+
+# Question content (text, options, answer) for sessions without embedded payloads
+QUESTION_CONTENT_PROJECTION = {
+    "question_text": 1,
+    "question_type": 1,
+    "difficulty": 1,
+    "topic": 1,
+    "section_title": 1,
+    "options": 1,
+    "correct_answer": 1,
+    "normalized_answer": 1,
+    "explanation": 1
+}
+
+
+def _session_oid(session_id: str) -> ObjectId:
+    """
+    Dependency converting the session_id path parameter, treating malformed ids
+    as not found. Cached per request like any dependency, so it runs once.
+    """
+    try:
+        return ObjectId(session_id)
+    except InvalidId:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Test session not found"
+        )
 
-@router.get("/in-progress", response_model=List[TestSessionResponse])
-async def get_in_progress_tests(
-    user_id: str = Depends(get_current_user_id),
-    db=Depends(get_database)
-):
-    """Get all in-progress tests for current user (only those worth resuming)"""
 
-    cursor = db.test_sessions.find({
-        "user_id": ObjectId(user_id),
-        "status": TestStatus.IN_PROGRESS
-    }).sort("started_at", -1)
+def _owned_session(projection: dict):
+    """
+    Dependency loading the caller's test session (404 if missing or not theirs).
+
+    FastAPI caches dependency results per request, so every consumer of the
+    same dependency shares a single read.
+    """
+    async def load_session(
+        session_oid: ObjectId = Depends(_session_oid),
+        user_oid: ObjectId = Depends(get_current_user_oid),
+        db=Depends(get_database)
+    ) -> dict:
+        session = await db.test_sessions.find_one(
+            {
+                "_id": session_oid,
+                "user_id": user_oid
+            },
+            projection
+        )
 
-    sessions = await cursor.to_list(length=100)
+        if not session:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Test session not found"
+            )
 
-    from app.models.test_session import TestConfig
+        return session
 
-    # Only return sessions with at least 1 correct answer (worth resuming)
-    worth_resuming = []
-    for s in sessions:
-        answers = s.get("answers", [])
-        has_correct = any(a.get("is_correct") == True for a in answers)
+    return load_session
+
+
+_summary_session = _owned_session(SESSION_SUMMARY_PROJECTION)
+# Only the current slot of the questions arrays is sent back, not the arrays
+_current_question_session = _owned_session({
+    "status": 1,
+    "current_question_index": 1,
+    "question_count": {"$size": {"$ifNull": ["$questions", []]}},
+    "current_question_id": {"$arrayElemAt": ["$questions", "$current_question_index"]},
+    "current_question": {
+        "$arrayElemAt": [{"$ifNull": ["$question_data", []]}, "$current_question_index"]
+    }
+})
+RESULTS_PROJECTION = {
+    "status": 1,
+    "answers": 1,
+    "score": 1,
+    "completed_at": 1,
+    "tricky_questions": {
+        "$map": {
+            "input": answers_where({"$eq": ["$$a.marked_tricky", True]}),
+            "in": "$$this.question_id"
+        }
+    },
+    "wrong_questions": {
+        "$map": {
+            "input": answers_where({"$eq": ["$$a.status", AnswerStatus.WRONG.value]}),
+            "in": "$$this.question_id"
+        }
+    }
+}
+_results_session = _owned_session(RESULTS_PROJECTION)
+_review_session = _owned_session({"answers": 1, "question_data": 1})
+_results_review_session = _owned_session({**RESULTS_PROJECTION, "question_data": 1})
+
+
+async def _store_score(db, session_oid: ObjectId) -> dict:
+    """Compute the final score server-side once and keep it on the completed session"""
+    updated = await db.test_sessions.find_one_and_update(
+        {"_id": session_oid},
+        [{"$set": {"score": SCORE_EXPRESSION}}],
+        projection={"score": 1},
+        return_document=ReturnDocument.AFTER
+    )
+    return updated["score"]
+
+
+def _completion_writes(db, session_oid: ObjectId) -> list:
+    """Writes derived from a session once it completes: its score and per-topic stats"""
+    return [
+        _store_score(db, session_oid),
+        AdvancedAnalyticsService.record_session_topic_stats([session_oid], db)
+    ]
+
+
+def _config_body(config: dict) -> dict:
+    """TestConfig fields of a stored config, filling defaults older sessions lack"""
+    return {
+        name: config[name] if name in config else field.get_default()
+        for name, field in TestConfig.model_fields.items()
+    }
+
+
+def _session_body(session: dict) -> dict:
+    """TestSessionResponse fields as a plain dict, straight from the session document"""
+    if "total_questions" in session:
+        total_questions = session["total_questions"]
+    else:
+        total_questions = len(session.get("questions", []))
+
+    return {
+        "_id": str(session["_id"]),
+        "document_id": str(session["document_id"]),
+        "config": _config_body(session["config"]),
+        "current_question_index": session["current_question_index"],
+        "total_questions": total_questions,
+        "status": session["status"],
+        "started_at": session["started_at"],
+        "completed_at": session.get("completed_at")
+    }
+
+
+def _unanswered(question_id: str) -> dict:
+    """
+    Initial stored answer for a question, matching QuestionAnswer's defaults
+    (built directly since the shape is fixed and needs no validation)
+    """
+    return {
+        "question_id": question_id,
+        "user_answer": None,
+        "is_correct": None,
+        "time_taken": 0,
+        "status": AnswerStatus.NOT_ATTEMPTED,
+        "marked_tricky": False,
+        "marked_review": False,
+        "answered_at": None,
+        "changed_answer": False,
+        "hesitation_count": 0,
+        "time_to_first_answer": None
+    }
 
-        if has_correct:
-            worth_resuming.append(
-                TestSessionResponse(
-                    _id=str(s["_id"]),
-                    document_id=str(s["document_id"]),
-                    config=TestConfig(**s["config"]),
-                    current_question_index=s["current_question_index"],
-                    total_questions=len(s.get("questions", [])),
-                    status=s["status"],
-                    started_at=s["started_at"],
-                    completed_at=s.get("completed_at")
-                )
-            )
 
-    return worth_resuming
+def _answer_body(answer: dict) -> dict:
+    """QuestionAnswer fields of a stored answer, filling defaults older answers lack"""
+    body = _unanswered(answer["question_id"])
+    body.update((k, v) for k, v in answer.items() if k in QuestionAnswer.model_fields)
+    return body
+
+
+def _graded_answer(question: dict, answer_data: SubmitAnswerRequest) -> dict:
+    """Grade a submitted answer, returning the answer to store in the session"""
+    # Correct answers are normalized at ingestion; older questions fall back
+    correct_answer = question.get("normalized_answer") or normalize_answer(question["correct_answer"])
+    is_correct = normalize_answer(answer_data.user_answer) == correct_answer
+
+    return {
+        "question_id": answer_data.question_id,
+        "user_answer": answer_data.user_answer,
+        "is_correct": is_correct,
+        "time_taken": answer_data.time_taken,
+        "status": AnswerStatus.CORRECT if is_correct else AnswerStatus.WRONG,
+        "answered_at": datetime.utcnow(),
+        # Initialize new behavioral fields
+        "changed_answer": False,  # TODO: Track in frontend
+        "hesitation_count": 0  # TODO: Track in frontend
+    }
+
+
+def _embed_question(question: dict) -> dict:
+    """Question payload embedded in the session so test ticks skip the questions lookup"""
+    return {
+        "_id": str(question["_id"]),
+        "question_text": question["question_text"],
+        "question_type": question["question_type"],
+        "difficulty": question["difficulty"],
+        "topic": question["topic"],
+        "section_title": question.get("section_title"),
+        "options": question.get("options"),
+        "correct_answer": question["correct_answer"],
+        "normalized_answer": question.get("normalized_answer") or normalize_answer(question["correct_answer"]),
+        "explanation": question["explanation"]
+    }
+
+
+def _embedded_question(session: dict, question_id: str):
+    """The embedded current question payload, if it is question_id (None for older sessions)"""
+    question = session.get("current_question")
+    if question is not None and question["_id"] == question_id:
+        return question
+    return None
+
+
+async def _question_content(db, question_id: str):
+    """Fetch a question's content by id (sessions without embedded question data)"""
+    return await db.questions.find_one(
+        {"_id": ObjectId(question_id)},
+        QUESTION_CONTENT_PROJECTION
+    )
+
+
+async def _results_body(session_id: str, session: dict, db) -> dict:
+    """TestResult fields for a completed session read with RESULTS_PROJECTION"""
+    if session["status"] != TestStatus.COMPLETED:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Test not yet completed"
+        )
+
+    # Score is stored at completion; sessions without one are backfilled here.
+    # The question id lists are computed by the read's projection.
+    score = session.get("score") or await _store_score(db, session["_id"])
+
+    return {
+        "session_id": session_id,
+        "score": score,
+        "answers": [_answer_body(answer) for answer in session["answers"]],
+        "tricky_questions": session["tricky_questions"],
+        "wrong_questions": session["wrong_questions"],
+        "completed_at": session["completed_at"]
+    }
+
+
+def _review_question_body(question: dict) -> dict:
+    """QuestionWithAnswer fields from an embedded or fetched question"""
+    return {
+        "_id": str(question["_id"]),
+        "question_text": question["question_text"],
+        "question_type": question["question_type"],
+        "difficulty": question["difficulty"],
+        "topic": question["topic"],
+        "section_title": question.get("section_title"),
+        "options": [
+            {
+                "text": opt["text"],
+                "is_correct": opt.get("is_correct", False),
+                "explanation": opt.get("explanation")
+            }
+            for opt in question.get("options") or []
+        ],
+        "correct_answer": question["correct_answer"],
+        "explanation": question["explanation"]
+    }
+
+
+async def _review_questions(session: dict, db) -> List[dict]:
+    """QuestionWithAnswer bodies for the marked and wrong questions of a session"""
+
+    # Get marked or wrong questions
+    review_question_ids = [
+        answer["question_id"]
+        for answer in session["answers"]
+        if (answer.get("marked_tricky") or
+            answer.get("marked_review") or
+            answer.get("status") == AnswerStatus.WRONG)
+    ]
+
+    if not review_question_ids:
+        return []
+
+    # Use embedded payloads; fetch any others in one query, keeping review order
+    by_id = {q["_id"]: q for q in session.get("question_data") or []}
+    missing_ids = [q_id for q_id in review_question_ids if q_id not in by_id]
+
+    if missing_ids:
+        docs = await db.questions.find(
+            {"_id": {"$in": [ObjectId(q_id) for q_id in missing_ids]}},
+            QUESTION_CONTENT_PROJECTION
+        ).to_list(length=len(missing_ids))
+        for doc in docs:
+            by_id[str(doc["_id"])] = doc
+
+    return [
+        _review_question_body(by_id[q_id])
+        for q_id in review_question_ids
+        if q_id in by_id
+    ]
+
+
+@router.get("/in-progress", response_model=List[TestSessionResponse])
+async def get_in_progress_tests(
+    user_oid: ObjectId = Depends(get_current_user_oid),
+    db=Depends(get_database)
+):
+    """Get all in-progress tests for current user (only those worth resuming)"""
+
+    # Only sessions with at least 1 correct answer are worth resuming;
+    # the question count is computed server-side instead of shipping the array
+    cursor = db.test_sessions.find(
+        {
+            "user_id": user_oid,
+            "status": TestStatus.IN_PROGRESS,
+            "answers": {"$elemMatch": {"is_correct": True}}
+        },
+        {
+            "document_id": 1,
+            "config": 1,
+            "current_question_index": 1,
+            "total_questions": {"$size": {"$ifNull": ["$questions", []]}},
+            "status": 1,
+            "started_at": 1,
+            "completed_at": 1
+        }
+    ).sort("started_at", -1).limit(100)
+
+    # Shape each session as its batch arrives instead of holding every document
+    return MongoJSONResponse([_session_body(s) async for s in cursor])
 
 
 @router.post("/start", response_model=TestSessionResponse, status_code=status.HTTP_201_CREATED)
@@ -72,12 +375,18 @@ async def start_test(
 ):
     """Start a new test session OR resume existing in-progress test"""
 
+    user_oid = ObjectId(user_id)
+    document_oid = ObjectId(test_config.document_id)
+
     # CHECK FOR EXISTING IN-PROGRESS TEST FIRST
-    existing_test = await db.test_sessions.find_one({
-        "user_id": ObjectId(user_id),
-        "document_id": ObjectId(test_config.document_id),
-        "status": TestStatus.IN_PROGRESS
-    })
+    existing_test = await db.test_sessions.find_one(
+        {
+            "user_id": user_oid,
+            "document_id": document_oid,
+            "status": TestStatus.IN_PROGRESS
+        },
+        {**SESSION_SUMMARY_PROJECTION, "answers.is_correct": 1}
+    )
 
     if existing_test:
         # Check if test is worth resuming (has at least 1 correct answer)
@@ -86,26 +395,22 @@ async def start_test(
 
         if has_correct:
             # Return existing test - user will resume where they left off
-            from app.models.test_session import TestConfig
-            return TestSessionResponse(
-                _id=str(existing_test["_id"]),
-                document_id=str(existing_test["document_id"]),
-                config=TestConfig(**existing_test["config"]),
-                current_question_index=existing_test["current_question_index"],
-                total_questions=len(existing_test.get("questions", [])),
-                status=existing_test["status"],
-                started_at=existing_test["started_at"],
-                completed_at=existing_test.get("completed_at")
+            return MongoJSONResponse(
+                _session_body(existing_test),
+                status_code=status.HTTP_201_CREATED
             )
         else:
             # Test has no correct answers, delete it and create new one
             await db.test_sessions.delete_one({"_id": existing_test["_id"]})
 
     # Verify document exists and belongs to user
-    document = await db.documents.find_one({
-        "_id": ObjectId(test_config.document_id),
-        "user_id": ObjectId(user_id)
-    })
+    document = await db.documents.find_one(
+        {
+            "_id": document_oid,
+            "user_id": user_oid
+        },
+        {"_id": 1}
+    )
 
     if not document:
         raise HTTPException(
@@ -137,7 +442,7 @@ async def start_test(
         num_missing = test_config.config.total_questions - len(selected_questions)
 
         # Trigger background question generation
-        from app.routes.questions import generate_questions_background
+        from app.routes.questions import submit_question_generation
         from app.models.question import QuestionType
 
         # Convert question types
@@ -145,16 +450,15 @@ async def start_test(
             QuestionType(qt) if isinstance(qt, str) else qt for qt in question_types
         ]
 
-        # Generate questions in background
-        import asyncio
-        asyncio.create_task(generate_questions_background(
+        # Generate questions in a worker process
+        submit_question_generation(
             document_id=test_config.document_id,
             user_id=user_id,
             num_questions=num_missing,
             difficulty_distribution=None,
             topics=test_config.config.topics or [],
             question_types=gen_question_types
-        ))
+        )
 
         # Inform user to wait
         raise HTTPException(
@@ -162,25 +466,18 @@ async def start_test(
             detail=f"Generating {num_missing} questions. Please wait 30-60 seconds and try again."
         )
 
-    # Mark these questions as used
     question_ids = [str(q["_id"]) for q in selected_questions]
-    await QuestionSelectionService.mark_questions_used(question_ids, db)
 
     # Initialize answers
-    answers = [
-        QuestionAnswer(
-            question_id=q_id,
-            status=AnswerStatus.NOT_ATTEMPTED
-        ).dict()
-        for q_id in question_ids
-    ]
+    answers = [_unanswered(q_id) for q_id in question_ids]
 
     # Create test session
     session = {
-        "user_id": ObjectId(user_id),
-        "document_id": ObjectId(test_config.document_id),
+        "user_id": user_oid,
+        "document_id": document_oid,
         "config": test_config.config.dict(),
         "questions": question_ids,
+        "question_data": [_embed_question(q) for q in selected_questions],
         "answers": answers,
         "current_question_index": 0,
         "status": TestStatus.IN_PROGRESS,
@@ -188,94 +485,62 @@ async def start_test(
         "completed_at": None
     }
 
-    result = await db.test_sessions.insert_one(session)
+    # Marking the questions used and creating the session are independent
+    # writes on different collections; issue them together
+    _, result = await asyncio.gather(
+        QuestionSelectionService.mark_questions_used(question_ids, db),
+        db.test_sessions.insert_one(session)
+    )
 
-    return TestSessionResponse(
-        _id=str(result.inserted_id),
-        document_id=test_config.document_id,
-        config=test_config.config,
-        current_question_index=0,
-        total_questions=test_config.config.total_questions,
-        status=TestStatus.IN_PROGRESS,
-        started_at=session["started_at"]
+    return MongoJSONResponse(
+        {
+            **_session_body({**session, "_id": result.inserted_id}),
+            "total_questions": test_config.config.total_questions
+        },
+        status_code=status.HTTP_201_CREATED
     )
 
 
 @router.get("/{session_id}", response_model=TestSessionResponse)
 async def get_test_session(
     session_id: str,
-    user_id: str = Depends(get_current_user_id),
-    db=Depends(get_database)
+    session: dict = Depends(_summary_session)
 ):
     """Get test session details"""
 
-    session = await db.test_sessions.find_one({
-        "_id": ObjectId(session_id),
-        "user_id": ObjectId(user_id)
-    })
-
-    if not session:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Test session not found"
-        )
-
-    from app.models.test_session import TestConfig
-
-    return TestSessionResponse(
-        _id=str(session["_id"]),
-        document_id=str(session["document_id"]),
-        config=TestConfig(**session["config"]),
-        current_question_index=session["current_question_index"],
-        total_questions=len(session["questions"]),
-        status=session["status"],
-        started_at=session["started_at"],
-        completed_at=session.get("completed_at")
-    )
+    return MongoJSONResponse(_session_body(session))
 
 
 @router.get("/{session_id}/current-question", response_model=QuestionResponse)
 async def get_current_question(
     session_id: str,
-    user_id: str = Depends(get_current_user_id),
+    session: dict = Depends(_current_question_session),
     db=Depends(get_database)
 ):
     """Get the current question for the test"""
 
-    session = await db.test_sessions.find_one({
-        "_id": ObjectId(session_id),
-        "user_id": ObjectId(user_id)
-    })
-
-    if not session:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Test session not found"
-        )
-
     if session["status"] != TestStatus.IN_PROGRESS:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Test is not in progress"
         )
 
-    current_index = session["current_question_index"]
-
     # Validate questions array exists and has items
-    if not session.get("questions") or len(session["questions"]) == 0:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Test session has no questions. Please create a new test."
-        )
-
-    if current_index >= len(session["questions"]):
+    question_id = session.get("current_question_id")
+    if question_id is None:
+        if session["current_question_index"] == 0:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Test session has no questions. Please create a new test."
+            )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="No more questions available. Test may be complete."
         )
 
-    question_id = session["questions"][current_index]
-    question = await db.questions.find_one({"_id": ObjectId(question_id)})
+    question = _embedded_question(session, question_id)
+    if question is None:
+        question = await _question_content(db, question_id)
 
     if not question:
         raise HTTPException(
@@ -283,39 +548,30 @@ async def get_current_question(
             detail="Question not found"
         )
 
-    return QuestionResponse(
-        _id=str(question["_id"]),
-        question_text=question["question_text"],
-        question_type=question["question_type"],
-        difficulty=question["difficulty"],
-        topic=question["topic"],
-        section_title=question.get("section_title"),
-        options=[
+    return MongoJSONResponse({
+        "_id": str(question["_id"]),
+        "question_text": question["question_text"],
+        "question_type": question["question_type"],
+        "difficulty": question["difficulty"],
+        "topic": question["topic"],
+        "section_title": question.get("section_title"),
+        "options": [
             {"text": opt["text"]}
             for opt in question.get("options", [])
         ] if question.get("options") else None
-    )
+    })
 
 
 @router.post("/{session_id}/submit-answer", response_model=SubmitAnswerResponse)
 async def submit_answer(
     session_id: str,
     answer_data: SubmitAnswerRequest,
-    user_id: str = Depends(get_current_user_id),
+    session: dict = Depends(_current_question_session),
     db=Depends(get_database)
 ):
     """Submit answer for current question"""
 
-    session = await db.test_sessions.find_one({
-        "_id": ObjectId(session_id),
-        "user_id": ObjectId(user_id)
-    })
-
-    if not session:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Test session not found"
-        )
+    session_oid = session["_id"]
 
     if session["status"] != TestStatus.IN_PROGRESS:
         raise HTTPException(
@@ -325,8 +581,17 @@ async def submit_answer(
 
     current_index = session["current_question_index"]
 
+    # The answer must be for the question stored at the current slot
+    if answer_data.question_id != session.get("current_question_id"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Answer does not match the current question in the test"
+        )
+
     # Get question and check answer
-    question = await db.questions.find_one({"_id": ObjectId(answer_data.question_id)})
+    question = _embedded_question(session, answer_data.question_id)
+    if question is None:
+        question = await _question_content(db, answer_data.question_id)
 
     if not question:
         raise HTTPException(
@@ -334,44 +599,16 @@ async def submit_answer(
             detail="Question not found"
         )
 
-    is_correct = answer_data.user_answer.strip().lower() == question["correct_answer"].strip().lower()
-
-    # Update empirical difficulty statistics
-    await QuestionStatsService.update_question_stats(
-        question_id=answer_data.question_id,
-        correct=is_correct,
-        time_taken=answer_data.time_taken,
-        db=db
-    )
-
-    # Update question performance tracking (for smart reuse)
-    await QuestionSelectionService.update_question_performance(
-        question_id=answer_data.question_id,
-        is_correct=is_correct,
-        db=db
-    )
-
-    # Update answer in session
-    answer_update = {
-        "question_id": answer_data.question_id,
-        "user_answer": answer_data.user_answer,
-        "is_correct": is_correct,
-        "time_taken": answer_data.time_taken,
-        "status": AnswerStatus.CORRECT if is_correct else AnswerStatus.WRONG,
-        "answered_at": datetime.utcnow(),
-        # Initialize new behavioral fields
-        "changed_answer": False,  # TODO: Track in frontend
-        "hesitation_count": 0  # TODO: Track in frontend
-    }
-
-    session["answers"][current_index] = answer_update
+    answer_update = _graded_answer(question, answer_data)
+    is_correct = answer_update["is_correct"]
 
     # Move to next question
     next_index = current_index + 1
-    is_complete = next_index >= len(session["questions"])
+    is_complete = next_index >= session["question_count"]
 
+    # Only write the answer that changed
     update_data = {
-        "answers": session["answers"],
+        f"answers.{current_index}": answer_update,
         "current_question_index": next_index
     }
 
@@ -379,33 +616,78 @@ async def submit_answer(
         update_data["status"] = TestStatus.COMPLETED
         update_data["completed_at"] = datetime.utcnow()
 
-    await db.test_sessions.update_one(
-        {"_id": ObjectId(session_id)},
-        {"$set": update_data}
+    # Only advance from the index we graded, so concurrent submits can't
+    # both write the same slot or skip a question
+    updated = await db.test_sessions.find_one_and_update(
+        {
+            "_id": session_oid,
+            "status": TestStatus.IN_PROGRESS,
+            "current_question_index": current_index
+        },
+        {"$set": update_data},
+        projection={"_id": 1}
     )
 
-    return SubmitAnswerResponse(
-        is_correct=is_correct,
-        correct_answer=question["correct_answer"],
-        explanation=question["explanation"],
-        next_question_index=next_index,
-        is_test_complete=is_complete
-    )
+    if updated is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Answer already submitted for this question"
+        )
 
+    # Follow-up writes are independent of each other; issue them together.
+    # Stats are not part of the response; they are written in batches
+    follow_ups = [
+        question_stats_batcher.record(
+            answer_data.question_id,
+            is_correct,
+            answer_data.time_taken
+        )
+    ]
+    if is_complete:
+        follow_ups.extend(_completion_writes(db, session_oid))
 
-@router.post("/{session_id}/mark-question", status_code=status.HTTP_200_OK)
-async def mark_question(
+    await asyncio.gather(*follow_ups)
+
+    return MongoJSONResponse({
+        "is_correct": is_correct,
+        "correct_answer": question["correct_answer"],
+        "explanation": question["explanation"],
+        "next_question_index": next_index,
+        "is_test_complete": is_complete
+    })
+
+
+@router.post("/{session_id}/submit-batch", response_model=List[SubmitAnswerResponse])
+async def submit_answer_batch(
     session_id: str,
-    mark_data: MarkQuestionRequest,
-    user_id: str = Depends(get_current_user_id),
+    batch: List[SubmitAnswerRequest],
+    session_oid: ObjectId = Depends(_session_oid),
+    user_oid: ObjectId = Depends(get_current_user_oid),
     db=Depends(get_database)
 ):
-    """Mark a question as tricky or for review"""
+    """Submit answers for the current question and the ones after it in one request"""
 
-    session = await db.test_sessions.find_one({
-        "_id": ObjectId(session_id),
-        "user_id": ObjectId(user_id)
-    })
+    if not batch:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No answers submitted"
+        )
+
+    # Only the slots being answered are read back
+    session = await db.test_sessions.find_one(
+        {"_id": session_oid, "user_id": user_oid},
+        {
+            "status": 1,
+            "current_question_index": 1,
+            "question_count": {"$size": {"$ifNull": ["$questions", []]}},
+            "questions": {
+                "$slice": [{"$ifNull": ["$questions", []]}, "$current_question_index", len(batch)]
+            },
+            "question_data": {
+                "$slice": [{"$ifNull": ["$question_data", []]}, "$current_question_index", len(batch)]
+            }
+        }
+    )
 
     if not session:
         raise HTTPException(
@@ -413,172 +695,212 @@ async def mark_question(
             detail="Test session not found"
         )
 
-    # Find answer and update marks
-    for answer in session["answers"]:
-        if answer["question_id"] == mark_data.question_id:
-            answer["marked_tricky"] = mark_data.marked_tricky
-            answer["marked_review"] = mark_data.marked_review
-            break
+    if session["status"] != TestStatus.IN_PROGRESS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Test is not in progress"
+        )
+
+    current_index = session["current_question_index"]
+    next_index = current_index + len(batch)
+    question_count = session["question_count"]
 
-    await db.test_sessions.update_one(
-        {"_id": ObjectId(session_id)},
-        {"$set": {"answers": session["answers"]}}
+    if next_index > question_count:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="More answers than remaining questions"
+        )
+
+    # Each answer must be for the question stored at its slot
+    if [a.question_id for a in batch] != session["questions"]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Answers do not match the next questions in the test"
+        )
+
+    # Use embedded payloads; fetch the others (older sessions) concurrently
+    embedded = {q["_id"]: q for q in session["question_data"]}
+    questions = [embedded.get(a.question_id) for a in batch]
+    missing = [i for i, question in enumerate(questions) if question is None]
+    fetched = await asyncio.gather(*(_question_content(db, batch[i].question_id) for i in missing))
+
+    for i, question in zip(missing, fetched):
+        if not question:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Question not found"
+            )
+        questions[i] = question
+
+    # Grade everything, then write all answers in one update
+    is_complete = next_index >= question_count
+    update_data = {"current_question_index": next_index}
+    results = []
+
+    for index, (answer_data, question) in enumerate(zip(batch, questions), start=current_index):
+        answer_update = _graded_answer(question, answer_data)
+        update_data[f"answers.{index}"] = answer_update
+        results.append({
+            "is_correct": answer_update["is_correct"],
+            "correct_answer": question["correct_answer"],
+            "explanation": question["explanation"],
+            "next_question_index": index + 1,
+            "is_test_complete": index + 1 >= question_count
+        })
+
+    if is_complete:
+        update_data["status"] = TestStatus.COMPLETED
+        update_data["completed_at"] = datetime.utcnow()
+
+    # Same guard as submit_answer: only advance from the index we graded
+    updated = await db.test_sessions.find_one_and_update(
+        {
+            "_id": session_oid,
+            "status": TestStatus.IN_PROGRESS,
+            "current_question_index": current_index
+        },
+        {"$set": update_data},
+        projection={"_id": 1}
     )
 
-    return {"status": "success"}
+    if updated is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Answers already submitted for these questions"
+        )
 
+    follow_ups = [
+        question_stats_batcher.record(
+            answer_data.question_id,
+            result["is_correct"],
+            answer_data.time_taken
+        )
+        for answer_data, result in zip(batch, results)
+    ]
+    if is_complete:
+        follow_ups.extend(_completion_writes(db, session_oid))
 
-@router.post("/{session_id}/finish-early", status_code=status.HTTP_200_OK)
-async def finish_test_early(
-    session_id: str,
-    user_id: str = Depends(get_current_user_id),
+    await asyncio.gather(*follow_ups)
+
+    return MongoJSONResponse(results)
+
+
+@router.post("/{session_id}/mark-question", status_code=status.HTTP_200_OK)
+async def mark_question(
+    mark_data: MarkQuestionRequest,
+    session_oid: ObjectId = Depends(_session_oid),
+    user_oid: ObjectId = Depends(get_current_user_oid),
     db=Depends(get_database)
 ):
-    """Finish test early and mark remaining questions as skipped"""
+    """Mark a question as tricky or for review"""
 
-    session = await db.test_sessions.find_one({
-        "_id": ObjectId(session_id),
-        "user_id": ObjectId(user_id)
-    })
+    # Update the matching answer in place; ownership is part of the filter
+    session = await db.test_sessions.find_one_and_update(
+        {
+            "_id": session_oid,
+            "user_id": user_oid
+        },
+        {
+            "$set": {
+                "answers.$[a].marked_tricky": mark_data.marked_tricky,
+                "answers.$[a].marked_review": mark_data.marked_review
+            }
+        },
+        array_filters=[{"a.question_id": mark_data.question_id}],
+        projection={"status": 1}
+    )
 
-    if not session:
+    if session is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Test session not found"
         )
 
+    # Marked counts are part of the score; keep a completed test's stored score current
     if session["status"] == TestStatus.COMPLETED:
-        return {"status": "already_completed"}
+        await _store_score(db, session_oid)
 
-    # Mark all remaining questions as skipped
-    current_index = session["current_question_index"]
-    answers = session["answers"]
+    return {"status": "success"}
 
-    for i in range(current_index, len(answers)):
-        if answers[i]["status"] == AnswerStatus.NOT_ATTEMPTED:
-            answers[i]["status"] = AnswerStatus.SKIPPED
-            answers[i]["answered_at"] = datetime.utcnow()
 
-    # Mark test as completed
-    await db.test_sessions.update_one(
-        {"_id": ObjectId(session_id)},
+@router.post("/{session_id}/finish-early", status_code=status.HTTP_200_OK)
+async def finish_test_early(
+    session_oid: ObjectId = Depends(_session_oid),
+    user_oid: ObjectId = Depends(get_current_user_oid),
+    db=Depends(get_database)
+):
+    """Finish test early and mark remaining questions as skipped"""
+
+    # Skip every unanswered question and complete the test in one update;
+    # ownership and status are part of the filter
+    now = datetime.utcnow()
+    result = await db.test_sessions.update_one(
+        {
+            "_id": session_oid,
+            "user_id": user_oid,
+            "status": {"$ne": TestStatus.COMPLETED}
+        },
         {"$set": {
             "status": TestStatus.COMPLETED,
-            "completed_at": datetime.utcnow(),
-            "answers": answers
-        }}
+            "completed_at": now,
+            "answers.$[a].status": AnswerStatus.SKIPPED,
+            "answers.$[a].answered_at": now
+        }},
+        array_filters=[{"a.status": AnswerStatus.NOT_ATTEMPTED}]
     )
 
+    if result.matched_count == 0:
+        session = await db.test_sessions.find_one(
+            {"_id": session_oid, "user_id": user_oid},
+            {"_id": 1}
+        )
+
+        if not session:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Test session not found"
+            )
+
+        return {"status": "already_completed"}
+
+    await asyncio.gather(*_completion_writes(db, session_oid))
+
     return {"status": "success"}
 
 
 @router.get("/{session_id}/results", response_model=TestResult)
 async def get_test_results(
     session_id: str,
-    user_id: str = Depends(get_current_user_id),
+    session: dict = Depends(_results_session),
     db=Depends(get_database)
 ):
     """Get test results and analytics"""
 
-    session = await db.test_sessions.find_one({
-        "_id": ObjectId(session_id),
-        "user_id": ObjectId(user_id)
-    })
-
-    if not session:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Test session not found"
-        )
-
-    if session["status"] != TestStatus.COMPLETED:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Test not yet completed"
-        )
-
-    # Calculate score
-    answers = [QuestionAnswer(**a) for a in session["answers"]]
-
-    correct = sum(1 for a in answers if a.status == AnswerStatus.CORRECT)
-    wrong = sum(1 for a in answers if a.status == AnswerStatus.WRONG)
-    skipped = sum(1 for a in answers if a.status == AnswerStatus.SKIPPED)
-    not_attempted = sum(1 for a in answers if a.status == AnswerStatus.NOT_ATTEMPTED)
-    total = len(answers)
-
-    percentage = (correct / total * 100) if total > 0 else 0
-    time_spent = sum(a.time_taken for a in answers)
-
-    marked_tricky = [a.question_id for a in answers if a.marked_tricky]
-    marked_review = [a.question_id for a in answers if a.marked_review]
-    wrong_questions = [a.question_id for a in answers if a.status == AnswerStatus.WRONG]
-
-    score = TestScore(
-        total_questions=total,
-        correct=correct,
-        wrong=wrong,
-        skipped=skipped,
-        not_attempted=not_attempted,
-        percentage=round(percentage, 2),
-        time_spent=time_spent,
-        marked_tricky_count=len(marked_tricky),
-        marked_review_count=len(marked_review)
-    )
-
-    return TestResult(
-        session_id=session_id,
-        score=score,
-        answers=answers,
-        tricky_questions=marked_tricky,
-        wrong_questions=wrong_questions,
-        completed_at=session["completed_at"]
-    )
+    return MongoJSONResponse(await _results_body(session_id, session, db))
 
 
 @router.get("/{session_id}/review-questions", response_model=List[QuestionWithAnswer])
 async def get_review_questions(
     session_id: str,
-    user_id: str = Depends(get_current_user_id),
+    session: dict = Depends(_review_session),
     db=Depends(get_database)
 ):
     """Get marked and wrong questions for review"""
 
-    session = await db.test_sessions.find_one({
-        "_id": ObjectId(session_id),
-        "user_id": ObjectId(user_id)
-    })
+    return MongoJSONResponse(await _review_questions(session, db))
 
-    if not session:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Test session not found"
-        )
 
-    # Get marked or wrong questions
-    review_question_ids = []
-    for answer in session["answers"]:
-        if (answer.get("marked_tricky") or
-            answer.get("marked_review") or
-            answer.get("status") == AnswerStatus.WRONG):
-            review_question_ids.append(answer["question_id"])
-
-    # Fetch full questions
-    questions = []
-    for q_id in review_question_ids:
-        question = await db.questions.find_one({"_id": ObjectId(q_id)})
-        if question:
-            from app.models.question import MCQOption
-
-            questions.append(QuestionWithAnswer(
-                _id=str(question["_id"]),
-                question_text=question["question_text"],
-                question_type=question["question_type"],
-                difficulty=question["difficulty"],
-                topic=question["topic"],
-                section_title=question.get("section_title"),
-                options=[MCQOption(**opt) for opt in question.get("options", [])],
-                correct_answer=question["correct_answer"],
-                explanation=question["explanation"]
-            ))
-
-    return questions
+@router.get("/{session_id}/summary", response_model=TestResultSummary)
+async def get_test_summary(
+    session_id: str,
+    session: dict = Depends(_results_review_session),
+    db=Depends(get_database)
+):
+    """Get test results together with the review questions, from one session read"""
+
+    results, review_questions = await asyncio.gather(
+        _results_body(session_id, session, db),
+        _review_questions(session, db)
+    )
+
+    return MongoJSONResponse({"results": results, "review_questions": review_questions})
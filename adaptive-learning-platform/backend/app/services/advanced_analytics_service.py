@@ -10,10 +10,13 @@ Advanced Analytics - World-Class Features
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
 from collections import defaultdict
+import asyncio
 import math
 import statistics
 
 from bson import ObjectId
+from pymongo import UpdateOne
+from app.core.cache import cache_manager, cache_key
 from app.models.analytics import (
     LearningVelocity,
     ForgettingCurveData,
@@ -24,6 +27,24 @@ from app.models.analytics import (
 )
 
 
+# Session fields needed to build topic stats; skips answer text and question payloads
+TOPIC_STATS_SESSION_PROJECTION = {
+    "user_id": 1,
+    "document_id": 1,
+    "completed_at": 1,
+    "questions": 1,
+    "question_data._id": 1,
+    "question_data.topic": 1,
+    "answers.question_id": 1,
+    "answers.status": 1,
+    "answers.hesitation_count": 1
+}
+
+# Per-topic results are keyed on the user's latest completion, so a new session
+# starts a fresh entry; the TTL only bounds how long superseded keys linger
+TOPIC_RESULT_CACHE_TTL = 86400
+
+
 class AdvancedAnalyticsService:
     """World-class analytics features"""
 
@@ -42,40 +63,24 @@ class AdvancedAnalyticsService:
 
         Returns: "You learn CNNs 3× faster than Transformers"
         """
+        key = await AdvancedAnalyticsService._topic_result_key(
+            "learning_velocity", user_id, topic, db
+        )
+        cached_result = await cache_manager.get(key)
+        if cached_result is not None:
+            return LearningVelocity(**cached_result)
 
-        # Get all sessions for this user, ordered by date
-        sessions = await db.test_sessions.find({
-            "user_id": ObjectId(user_id),
-            "status": "completed"
-        }).sort("completed_at", 1).to_list(length=100)
-
-        # Calculate mastery for this topic in each session
-        mastery_trajectory = []
-
-        for session in sessions:
-            # Calculate topic mastery for this session
-            topic_stats = {"correct": 0, "total": 0}
-
-            # Get questions for this session
-            question_ids = [ObjectId(qid) for qid in session["questions"]]
-            questions = await db.questions.find({
-                "_id": {"$in": question_ids},
-                "topic": topic
-            }).to_list(length=1000)
-
-            question_id_set = {str(q["_id"]) for q in questions}
-
-            # Count correct answers for this topic
-            for answer in session["answers"]:
-                if answer["question_id"] in question_id_set:
-                    topic_stats["total"] += 1
-                    if answer.get("status") == "correct":
-                        topic_stats["correct"] += 1
+        # Mastery for this topic in each session, ordered by date
+        rows = await AdvancedAnalyticsService._topic_stat_rows(user_id, db, topic=topic)
+        mastery_trajectory = [row["correct"] / row["total"] for row in rows]
 
-            if topic_stats["total"] > 0:
-                mastery = topic_stats["correct"] / topic_stats["total"]
-                mastery_trajectory.append(mastery)
+        velocity = AdvancedAnalyticsService._learning_velocity(topic, mastery_trajectory)
+        await cache_manager.set(key, velocity.model_dump(mode="json"), TOPIC_RESULT_CACHE_TTL)
+        return velocity
 
+    @staticmethod
+    def _learning_velocity(topic: str, mastery_trajectory: List[float]) -> LearningVelocity:
+        """Velocity, acceleration and sessions-to-mastery from a per-session mastery series"""
         if len(mastery_trajectory) < 2:
             return LearningVelocity(
                 topic=topic,
@@ -129,27 +134,16 @@ class AdvancedAnalyticsService:
         Returns: "You learn CNNs 3× faster than Transformers"
         """
 
-        # Get all topics for this user
-        sessions = await db.test_sessions.find({
-            "user_id": ObjectId(user_id),
-            "status": "completed"
-        }).to_list(length=100)
-
-        topics = set()
-        for session in sessions:
-            question_ids = [ObjectId(qid) for qid in session["questions"]]
-            questions = await db.questions.find({
-                "_id": {"$in": question_ids}
-            }).to_list(length=1000)
-            topics.update(q["topic"] for q in questions)
+        # Every topic's trajectory from one read of the stored topic stats
+        trajectories = defaultdict(list)
+        for row in await AdvancedAnalyticsService._topic_stat_rows(user_id, db):
+            trajectories[row["topic"]].append(row["correct"] / row["total"])
 
         # Calculate velocity for each topic
-        velocities = []
-        for topic in topics:
-            velocity_data = await AdvancedAnalyticsService.calculate_learning_velocity(
-                user_id, topic, db
-            )
-            velocities.append(velocity_data)
+        velocities = [
+            AdvancedAnalyticsService._learning_velocity(topic, trajectory)
+            for topic, trajectory in trajectories.items()
+        ]
 
         # Sort by velocity (fastest learners first)
         velocities.sort(key=lambda v: v.velocity, reverse=True)
@@ -166,24 +160,166 @@ class AdvancedAnalyticsService:
 
         return velocities
 
+    @staticmethod
+    async def _topic_result_key(kind: str, user_id: str, topic: str, db) -> str:
+        """Cache key for a per-topic result, tied to the user's latest completed session"""
+        latest = await db.test_sessions.find_one(
+            {"user_id": ObjectId(user_id), "status": "completed"},
+            {"completed_at": 1},
+            sort=[("completed_at", -1)]
+        )
+        stamp = latest.get("completed_at") if latest else None
+        return cache_key(
+            "analytics", kind, user_id, topic,
+            stamp.isoformat() if stamp else "none"
+        )
+
+    @staticmethod
+    async def _recorded_session_ids(
+        user_id: str,
+        db,
+        document_id: Optional[str] = None
+    ) -> List[ObjectId]:
+        """
+        Ids of a user's completed sessions (oldest first) whose topic stats are stored
+
+        Rows are written when a session completes; sessions completed before
+        that (no topic_stats_recorded flag) are backfilled here on first read.
+        """
+        query = {
+            "user_id": ObjectId(user_id),
+            "status": "completed"
+        }
+        if document_id:
+            query["document_id"] = ObjectId(document_id)
+
+        sessions = await db.test_sessions.find(
+            query,
+            {"topic_stats_recorded": 1}
+        ).sort("completed_at", 1).to_list(length=100)
+
+        unrecorded = [s["_id"] for s in sessions if not s.get("topic_stats_recorded")]
+        if unrecorded:
+            await AdvancedAnalyticsService.record_session_topic_stats(unrecorded, db)
+
+        return [s["_id"] for s in sessions]
+
+    @staticmethod
+    async def _topic_stat_rows(
+        user_id: str,
+        db,
+        topic: Optional[str] = None
+    ) -> List[Dict]:
+        """Per-(session, topic) stats of a user's completed sessions, oldest first"""
+        session_ids = await AdvancedAnalyticsService._recorded_session_ids(user_id, db)
+        if not session_ids:
+            return []
+
+        row_query = {"session_id": {"$in": session_ids}}
+        if topic is not None:
+            row_query["topic"] = topic
+
+        return await db.session_topic_stats.find(
+            row_query,
+            {"_id": 0}
+        ).sort("completed_at", 1).to_list(length=None)
+
+    @staticmethod
+    async def record_session_topic_stats(session_ids: List[ObjectId], db):
+        """Upsert per-topic stats rows for completed sessions and flag them as recorded"""
+        sessions = await db.test_sessions.find(
+            {"_id": {"$in": session_ids}},
+            TOPIC_STATS_SESSION_PROJECTION
+        ).to_list(length=len(session_ids))
+
+        if not sessions:
+            return
+
+        question_topics = await AdvancedAnalyticsService._question_topics(sessions, db)
+
+        writes = []
+        for session in sessions:
+            for topic, stats in AdvancedAnalyticsService._session_topic_rows(session, question_topics).items():
+                writes.append(UpdateOne(
+                    {"session_id": session["_id"], "topic": topic},
+                    {"$set": {
+                        "user_id": session["user_id"],
+                        "document_id": session["document_id"],
+                        "completed_at": session["completed_at"],
+                        **stats
+                    }},
+                    upsert=True
+                ))
+
+        if writes:
+            await db.session_topic_stats.bulk_write(writes, ordered=False)
+
+        await db.test_sessions.update_many(
+            {"_id": {"$in": [session["_id"] for session in sessions]}},
+            {"$set": {"topic_stats_recorded": True}}
+        )
+
+    @staticmethod
+    async def _question_topics(sessions: List[Dict], db) -> Dict[str, str]:
+        """Map every question in the sessions to its topic with at most one query"""
+        topics = {}
+        for session in sessions:
+            for question in session.get("question_data") or []:
+                topics[question["_id"]] = question["topic"]
+
+        # Sessions created before question payloads were embedded
+        missing = {
+            qid for session in sessions for qid in session.get("questions", [])
+            if qid not in topics
+        }
+        if missing:
+            cursor = db.questions.find(
+                {"_id": {"$in": [ObjectId(qid) for qid in missing]}},
+                {"topic": 1}
+            )
+            async for question in cursor:
+                topics[str(question["_id"])] = question["topic"]
+
+        return topics
+
+    @staticmethod
+    def _session_topic_rows(session: Dict, question_topics: Dict[str, str]) -> Dict[str, Dict[str, int]]:
+        """Answer counts per topic for one session, in a single pass over its answers"""
+        rows = {}
+
+        for answer in session["answers"]:
+            topic = question_topics.get(answer["question_id"])
+            if topic is None:
+                continue
+
+            row = rows.get(topic)
+            if row is None:
+                row = rows[topic] = {"correct": 0, "total": 0, "answered": 0, "hesitation": 0}
+
+            row["total"] += 1
+            status = answer.get("status")
+            if status == "correct":
+                row["correct"] += 1
+            if status in ("correct", "wrong"):
+                row["answered"] += 1
+                row["hesitation"] += answer.get("hesitation_count", 0)
+
+        return rows
+
     @staticmethod
     def _calculate_slope(values: List[float]) -> float:
         """Calculate linear regression slope"""
         if len(values) < 2:
             return 0.0
 
+        # x is 0..n-1, so its mean and spread have closed forms:
+        # sum((x - x_mean)^2) = n(n^2 - 1)/12, and sum((x - x_mean)(y - y_mean))
+        # = sum(x*y) - x_mean*sum(y); one pass over the values is enough
         n = len(values)
-        x = list(range(n))
-        y = values
+        x_mean = (n - 1) / 2
 
-        x_mean = sum(x) / n
-        y_mean = sum(y) / n
-
-        numerator = sum((x[i] - x_mean) * (y[i] - y_mean) for i in range(n))
-        denominator = sum((x[i] - x_mean) ** 2 for i in range(n))
-
-        if denominator == 0:
-            return 0.0
+        numerator = sum(i * y for i, y in enumerate(values)) - x_mean * sum(values)
+        denominator = n * (n * n - 1) / 12
 
         return numerator / denominator
 
@@ -203,41 +339,27 @@ class AdvancedAnalyticsService:
         Uses Ebbinghaus forgetting curve: R = e^(-t/S)
         Where R = retention, t = time, S = stability
         """
+        key = await AdvancedAnalyticsService._topic_result_key(
+            "forgetting_curve", user_id, topic, db
+        )
+        cached_result = await cache_manager.get(key)
+        if cached_result is not None:
+            return ForgettingCurveData(**cached_result)
 
-        # Get all sessions for this user, ordered by date
-        sessions = await db.test_sessions.find({
-            "user_id": ObjectId(user_id),
-            "status": "completed"
-        }).sort("completed_at", 1).to_list(length=100)
+        # Topic mastery in each session, ordered by date
+        rows = await AdvancedAnalyticsService._topic_stat_rows(user_id, db, topic=topic)
+        curve = AdvancedAnalyticsService._forgetting_curve(topic, rows)
 
-        mastery_by_date = []
+        await cache_manager.set(key, curve.model_dump(mode="json"), TOPIC_RESULT_CACHE_TTL)
+        return curve
 
-        for session in sessions:
-            # Get topic mastery for this session
-            topic_stats = {"correct": 0, "total": 0}
-
-            question_ids = [ObjectId(qid) for qid in session["questions"]]
-            questions = await db.questions.find({
-                "_id": {"$in": question_ids},
-                "topic": topic
-            }).to_list(length=1000)
-
-            question_id_set = {str(q["_id"]) for q in questions}
-
-            for answer in session["answers"]:
-                if answer["question_id"] in question_id_set:
-                    topic_stats["total"] += 1
-                    if answer.get("status") == "correct":
-                        topic_stats["correct"] += 1
-
-            if topic_stats["total"] > 0:
-                mastery = topic_stats["correct"] / topic_stats["total"]
-                mastery_by_date.append({
-                    "mastery": mastery,
-                    "date": session["completed_at"]
-                })
-
-        if not mastery_by_date:
+    @staticmethod
+    def _forgetting_curve(topic: str, rows: List[Dict]) -> ForgettingCurveData:
+        """Peak, current mastery and decay from a topic's per-session stats rows"""
+        masteries = [row["correct"] / row["total"] for row in rows]
+        dates = [row["completed_at"] for row in rows]
+
+        if not masteries:
             return ForgettingCurveData(
                 topic=topic,
                 peak_mastery=0.0,
@@ -249,14 +371,14 @@ class AdvancedAnalyticsService:
                 needs_review=False
             )
 
-        # Find peak mastery
-        peak_entry = max(mastery_by_date, key=lambda x: x["mastery"])
-        peak_mastery = peak_entry["mastery"]
-        peak_date = peak_entry["date"]
+        # Find peak mastery (earliest session on ties)
+        peak_index = masteries.index(max(masteries))
+        peak_mastery = masteries[peak_index]
+        peak_date = dates[peak_index]
 
         # Current mastery (most recent)
-        current_mastery = mastery_by_date[-1]["mastery"]
-        current_date = mastery_by_date[-1]["date"]
+        current_mastery = masteries[-1]
+        current_date = dates[-1]
 
         days_since_peak = (current_date - peak_date).days
 
@@ -265,8 +387,14 @@ class AdvancedAnalyticsService:
             # R = e^(-t/S) => ln(R) = -t/S => S = -t/ln(R)
             retention_ratio = current_mastery / peak_mastery
             if retention_ratio > 0:
-                # Decay rate per day
-                decay_rate = -math.log(retention_ratio) / days_since_peak
+                # Decay rate per day: least-squares over every session since the
+                # peak when there are enough, otherwise from peak and current only
+                decay_rate = AdvancedAnalyticsService._fit_decay_rate(
+                    masteries[peak_index:],
+                    dates[peak_index:]
+                )
+                if decay_rate is None:
+                    decay_rate = -math.log(retention_ratio) / days_since_peak
 
                 # Half-life: time for mastery to halve
                 half_life_days = math.log(2) / decay_rate if decay_rate > 0 else None
@@ -295,6 +423,34 @@ class AdvancedAnalyticsService:
             needs_review=needs_review
         )
 
+    @staticmethod
+    def _fit_decay_rate(masteries: List[float], dates: List[datetime]) -> Optional[float]:
+        """
+        Least-squares decay rate k in ln(R) = -k*t, where R is mastery relative
+        to the peak (first entry) and t is days since it
+
+        Returns None with fewer than two later sessions, when a later session has
+        zero mastery (ln undefined) or when they all fall on the peak's day.
+        """
+        peak_mastery, peak_date = masteries[0], dates[0]
+        samples = list(zip(masteries[1:], dates[1:]))
+
+        if len(samples) < 2 or any(mastery <= 0 for mastery, _ in samples):
+            return None
+
+        # Fit through the origin: R = 1 at the peak by definition
+        sum_tt = 0.0
+        sum_ty = 0.0
+        for mastery, date in samples:
+            t = (date - peak_date).days
+            sum_tt += t * t
+            sum_ty += t * math.log(mastery / peak_mastery)
+
+        if sum_tt == 0:
+            return None
+
+        return -sum_ty / sum_tt
+
     # ============================================================
     # 3. EXAM READINESS SCORE
     # ============================================================
@@ -311,76 +467,59 @@ class AdvancedAnalyticsService:
         Returns: "You are 72% ready for this exam"
         """
 
-        # Get all completed sessions for this document
-        sessions = await db.test_sessions.find({
-            "user_id": ObjectId(user_id),
-            "document_id": ObjectId(document_id),
-            "status": "completed"
-        }).to_list(length=100)
+        # Completed sessions for this document
+        session_ids = await AdvancedAnalyticsService._recorded_session_ids(user_id, db, document_id)
 
-        if not sessions:
+        if not session_ids:
             return AdvancedAnalyticsService._default_readiness()
 
-        # Get all topics in document
-        all_questions = await db.questions.find({
-            "document_id": ObjectId(document_id)
-        }).to_list(length=10000)
-
-        all_topics = set(q["topic"] for q in all_questions)
+        # Mean/variance of per-session mastery and answer totals per topic are
+        # reduced by the database; only one row per topic comes back.
+        # Alongside, get all topics in document
+        session_mastery = {"$divide": ["$correct", "$total"]}
+        topic_rows, all_topics = await asyncio.gather(
+            db.session_topic_stats.aggregate([
+                {"$match": {"session_id": {"$in": session_ids}}},
+                {"$group": {
+                    "_id": "$topic",
+                    "mastery": {"$avg": session_mastery},
+                    "mastery_stddev": {"$stdDevSamp": session_mastery},
+                    "hesitation": {"$sum": "$hesitation"},
+                    "answered": {"$sum": "$answered"}
+                }}
+            ]).to_list(length=None),
+            db.questions.distinct("topic", {"document_id": ObjectId(document_id)})
+        )
+        all_topics = set(all_topics)
+        topic_stats = {row["_id"]: row for row in topic_rows}
 
         # Calculate topic masteries
         topic_masteries = {}
         topic_variances = {}
 
         for topic in all_topics:
-            mastery_values = []
-
-            for session in sessions:
-                topic_stats = {"correct": 0, "total": 0}
-
-                question_ids = [ObjectId(qid) for qid in session["questions"]]
-                questions = await db.questions.find({
-                    "_id": {"$in": question_ids},
-                    "topic": topic
-                }).to_list(length=1000)
+            stats = topic_stats.get(topic)
 
-                question_id_set = {str(q["_id"]) for q in questions}
-
-                for answer in session["answers"]:
-                    if answer["question_id"] in question_id_set:
-                        topic_stats["total"] += 1
-                        if answer.get("status") == "correct":
-                            topic_stats["correct"] += 1
-
-                if topic_stats["total"] > 0:
-                    mastery = topic_stats["correct"] / topic_stats["total"]
-                    mastery_values.append(mastery)
-
-            if mastery_values:
-                topic_masteries[topic] = statistics.mean(mastery_values)
-                topic_variances[topic] = statistics.variance(mastery_values) if len(mastery_values) > 1 else 0
+            if stats:
+                topic_masteries[topic] = stats["mastery"]
+                # Sample stddev is null for a single session
+                topic_variances[topic] = (stats["mastery_stddev"] or 0) ** 2
             else:
                 topic_masteries[topic] = 0.0
                 topic_variances[topic] = 0.0
 
         # 1. MASTERY SCORE (40% weight)
-        mastery_score = statistics.mean(topic_masteries.values()) if topic_masteries else 0
+        mastery_score = statistics.fmean(topic_masteries.values()) if topic_masteries else 0
 
         # 2. CONSISTENCY SCORE (25% weight)
         # Low variance = high consistency
-        avg_variance = statistics.mean(topic_variances.values()) if topic_variances else 0
+        avg_variance = statistics.fmean(topic_variances.values()) if topic_variances else 0
         consistency_score = max(0, 1 - avg_variance * 2)  # Normalize variance
 
         # 3. CONFIDENCE SCORE (20% weight)
         # Based on hesitation and speed
-        total_hesitation = 0
-        total_answers = 0
-
-        for session in sessions:
-            for answer in session["answers"]:
-                if answer.get("status") in ["correct", "wrong"]:
-                    total_answers += 1
-                    total_hesitation += answer.get("hesitation_count", 0)
+        total_hesitation = sum(row["hesitation"] for row in topic_rows)
+        total_answers = sum(row["answered"] for row in topic_rows)
 
         avg_hesitation = total_hesitation / total_answers if total_answers > 0 else 0
         confidence_score = max(0, 1 - avg_hesitation * 0.2)
@@ -474,52 +613,91 @@ class AdvancedAnalyticsService:
         if not signals:
             return AdvancedAnalyticsService._default_fingerprint(user_id)
 
-        answered = [s for s in signals if s.answered]
         total = len(signals)
 
-        if not answered:
+        # Every count below comes from one pass over the signals
+        answered_count = 0
+        correct_count = 0
+        time_sum = 0
+        hesitation_sum = 0
+        marked_count = 0
+        fast_count = 0  # < 20s
+        fast_correct_count = 0  # < 20s and correct
+        quick_correct_count = 0  # < 30s and correct
+        slow_count = 0  # > 60s
+        slow_wrong_count = 0  # > 60s and wrong
+        hard_attempts = 0
+        hard_skips = 0
+        easy_skips = 0
+
+        for s in signals:
+            if not s.answered:
+                if s.empirical_difficulty < 0.3:
+                    hard_skips += 1
+                elif s.empirical_difficulty > 0.7:
+                    easy_skips += 1
+                continue
+
+            answered_count += 1
+            time_sum += s.time_spent
+            hesitation_sum += s.hesitation_count
+            if s.correct:
+                correct_count += 1
+            if s.marked_tricky:
+                marked_count += 1
+            if s.empirical_difficulty < 0.3:
+                hard_attempts += 1
+
+            if s.time_spent < 20:
+                fast_count += 1
+                if s.correct:
+                    fast_correct_count += 1
+            if s.time_spent < 30 and s.correct:
+                quick_correct_count += 1
+            if s.time_spent > 60:
+                slow_count += 1
+                if not s.correct:
+                    slow_wrong_count += 1
+
+        if not answered_count:
             return AdvancedAnalyticsService._default_fingerprint(user_id)
 
         # === CORE TRAITS (0-1 scale) ===
 
         # 1. RISK TAKING: Answers fast even when uncertain
-        fast_count = sum(1 for s in answered if s.time_spent < 20)
-        fast_rate = fast_count / len(answered)
-        fast_accuracy = sum(1 for s in answered if s.time_spent < 20 and s.correct) / fast_count if fast_count > 0 else 0
+        fast_rate = fast_count / answered_count
+        fast_accuracy = fast_correct_count / fast_count if fast_count > 0 else 0
         # High risk = high fast rate, even if accuracy suffers
         risk_taking = fast_rate * (1 + (1 - fast_accuracy) * 0.5)
         risk_taking = min(1.0, risk_taking)
 
         # 2. PERFECTIONISM: Slow, changes answers, marks tricky
-        avg_hesitation = sum(s.hesitation_count for s in answered) / len(answered)
-        marked_rate = sum(1 for s in answered if s.marked_tricky) / len(answered)
-        slow_rate = sum(1 for s in answered if s.time_spent > 60) / len(answered)
+        avg_hesitation = hesitation_sum / answered_count
+        marked_rate = marked_count / answered_count
+        slow_rate = slow_count / answered_count
         perfectionism = (avg_hesitation * 0.3 + marked_rate * 0.4 + slow_rate * 0.3)
         perfectionism = min(1.0, perfectionism)
 
         # 3. SKIMMING: Fast, skips hard questions
-        skip_rate = (total - len(answered)) / total
-        hard_skips = sum(1 for s in signals if not s.answered and s.empirical_difficulty < 0.3)
-        hard_skip_rate = hard_skips / (total - len(answered)) if (total - len(answered)) > 0 else 0
+        skipped_count = total - answered_count
+        skip_rate = skipped_count / total
+        hard_skip_rate = hard_skips / skipped_count if skipped_count > 0 else 0
         skimming = (skip_rate * 0.6 + hard_skip_rate * 0.4)
         skimming = min(1.0, skimming)
 
         # 4. GRINDING: Slow but thorough, high accuracy
-        accuracy = sum(1 for s in answered if s.correct) / len(answered)
-        slow_accurate = sum(1 for s in answered if s.time_spent > 60 and s.correct) / len(answered)
+        accuracy = correct_count / answered_count
         grinding = slow_rate * accuracy
         grinding = min(1.0, grinding)
 
         # === DETAILED METRICS ===
 
         # Confidence calibration: Are they confident when correct?
-        fast_correct = sum(1 for s in answered if s.time_spent < 30 and s.correct)
-        slow_wrong = sum(1 for s in answered if s.time_spent > 60 and not s.correct)
-        confidence_calibration = (fast_correct - slow_wrong) / len(answered)
+        confidence_calibration = (quick_correct_count - slow_wrong_count) / answered_count
         confidence_calibration = max(0, min(1, (confidence_calibration + 1) / 2))  # Normalize to 0-1
 
         # Speed-accuracy tradeoff
-        avg_time = sum(s.time_spent for s in answered) / len(answered)
+        avg_time = time_sum / answered_count
         # -1 (slow accurate) to +1 (fast sloppy)
         speed_norm = (avg_time - 45) / 45  # Normalize around 45s
         accuracy_norm = (accuracy - 0.5) / 0.5  # Normalize around 50%
@@ -527,8 +705,6 @@ class AdvancedAnalyticsService:
         speed_accuracy_tradeoff = max(-1, min(1, speed_accuracy_tradeoff))
 
         # Difficulty seeking
-        hard_attempts = sum(1 for s in answered if s.empirical_difficulty < 0.3)
-        easy_skips = sum(1 for s in signals if not s.answered and s.empirical_difficulty > 0.7)
         difficulty_seeking = (hard_attempts - easy_skips) / total
         difficulty_seeking = max(0, min(1, (difficulty_seeking + 1) / 2))
 
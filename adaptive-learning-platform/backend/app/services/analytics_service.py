@@ -1,4 +1,4 @@
-from typing import List, Dict
+from typing import List, Dict, Optional
 from collections import defaultdict
 from app.models.test_session import QuestionAnswer, AnswerStatus
 from app.models.analytics import (
@@ -49,10 +49,16 @@ class AnalyticsService:
 
         return patterns
 
+    @staticmethod
+    def build_question_lookup(questions_data: List[Dict]) -> Dict[str, Dict]:
+        """Map question id to question, to share between the analysis steps"""
+        return {q["_id"]: q for q in questions_data}
+
     @staticmethod
     def calculate_topic_mastery(
         answers: List[QuestionAnswer],
-        questions_data: List[Dict]
+        questions_data: List[Dict],
+        question_lookup: Optional[Dict[str, Dict]] = None
     ) -> List[TopicMastery]:
         """Calculate mastery level for each topic"""
 
@@ -64,8 +70,8 @@ class AnalyticsService:
             "difficulties": defaultdict(lambda: {"correct": 0, "wrong": 0})
         })
 
-        # Build question lookup
-        question_lookup = {q["_id"]: q for q in questions_data}
+        if question_lookup is None:
+            question_lookup = AnalyticsService.build_question_lookup(questions_data)
 
         for answer in answers:
             if answer.status in [AnswerStatus.CORRECT, AnswerStatus.WRONG]:
@@ -112,31 +118,41 @@ class AnalyticsService:
     def identify_weakness_areas(
         topic_mastery: List[TopicMastery],
         patterns: Dict[str, List[str]],
-        questions_data: List[Dict]
+        questions_data: List[Dict],
+        question_lookup: Optional[Dict[str, Dict]] = None
     ) -> List[WeaknessAnalysis]:
-        """Identify and prioritize weakness areas"""
+        """Identify and prioritize weakness areas, highest priority first"""
 
         weaknesses = []
-        question_lookup = {q["_id"]: q for q in questions_data}
+        if question_lookup is None:
+            question_lookup = AnalyticsService.build_question_lookup(questions_data)
+
+        # Bucket questions by topic once instead of scanning them per topic
+        topic_question_ids = defaultdict(list)
+        for q_id, q in question_lookup.items():
+            topic_question_ids[q.get("topic")].append(q_id)
+
+        fast_wrong = set(patterns["fast_wrong"])
+        slow_wrong = set(patterns["slow_wrong"])
+        tricky_wrong = set(patterns["tricky_wrong"])
+        timed_wrong = fast_wrong | slow_wrong
 
         for mastery in topic_mastery:
             if mastery.mastery_percentage < 70:  # Below 70% = weakness
                 topic = mastery.topic
 
                 # Find questions for this topic
-                topic_questions = [
-                    q_id for q_id, q in question_lookup.items()
-                    if q.get("topic") == topic
-                ]
+                topic_questions = topic_question_ids.get(topic, [])
+                topic_question_set = set(topic_questions)
 
                 # Identify failure patterns
                 failure_patterns = []
                 priority_score = 0
 
                 # Check pattern presence
-                fast_wrong_count = len([q for q in topic_questions if q in patterns["fast_wrong"]])
-                slow_wrong_count = len([q for q in topic_questions if q in patterns["slow_wrong"]])
-                tricky_wrong_count = len([q for q in topic_questions if q in patterns["tricky_wrong"]])
+                fast_wrong_count = len(topic_question_set & fast_wrong)
+                slow_wrong_count = len(topic_question_set & slow_wrong)
+                tricky_wrong_count = len(topic_question_set & tricky_wrong)
 
                 if fast_wrong_count > 0:
                     failure_patterns.append(FailurePattern.FAST_WRONG)
@@ -153,7 +169,7 @@ class AnalyticsService:
                 # Check for easy questions failed (dangerous gap)
                 easy_failed = [
                     q_id for q_id in topic_questions
-                    if question_lookup[q_id].get("difficulty") == "easy" and q_id in patterns.get("fast_wrong", []) + patterns.get("slow_wrong", [])
+                    if question_lookup[q_id].get("difficulty") == "easy" and q_id in timed_wrong
                 ]
                 if easy_failed:
                     failure_patterns.append(FailurePattern.EASY_WRONG)
@@ -213,7 +229,7 @@ class AnalyticsService:
     def generate_adaptive_targeting(
         weakness_areas: List[WeaknessAnalysis]
     ) -> AdaptiveTargeting:
-        """Generate targeting for next test based on weaknesses"""
+        """Generate targeting for next test from weaknesses ordered by priority (as identify_weakness_areas returns them)"""
 
         # Get high-priority topics (top 60% of priority scores)
         if not weakness_areas:
@@ -224,9 +240,8 @@ class AnalyticsService:
                 estimated_questions_needed=10
             )
 
-        sorted_weaknesses = sorted(weakness_areas, key=lambda x: x.priority_score, reverse=True)
-        cutoff_index = max(1, int(len(sorted_weaknesses) * 0.6))
-        top_weaknesses = sorted_weaknesses[:cutoff_index]
+        cutoff_index = max(1, int(len(weakness_areas) * 0.6))
+        top_weaknesses = weakness_areas[:cutoff_index]
 
         weak_topics = [w.topic for w in top_weaknesses]
 
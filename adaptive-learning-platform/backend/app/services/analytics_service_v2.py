@@ -26,6 +26,9 @@ from app.models.analytics import (
     QuestionStatistics
 )
 
+# Per-attempt recency factor for weighted mastery: exp(-0.14) per older attempt
+RECENCY_DECAY = math.exp(-0.14)
+
 
 class AnalyticsServiceV2:
     """Signal-based, mathematical analytics - no vibes"""
@@ -117,7 +120,8 @@ class AnalyticsServiceV2:
         """Mathematical topic mastery: weighted_avg(correctness × difficulty × recency)"""
 
         topic_data = defaultdict(lambda: {
-            "attempts": [],
+            "outcomes": [],
+            "difficulties": [],
             "total": 0,
             "correct": 0,
             "wrong": 0,
@@ -140,33 +144,19 @@ class AnalyticsServiceV2:
             data["time_sum"] += signal.time_spent
 
             # Store for weighted calculation
-            data["attempts"].append({
-                "correct": signal.correct,
-                "difficulty": signal.empirical_difficulty,
-                "timestamp": datetime.utcnow()  # Would come from answer object
-            })
-
-            if signal.correct:
-                data["correct"] += 1
-            else:
-                data["wrong"] += 1
+            data["outcomes"].append(signal.correct)
+            data["difficulties"].append(signal.empirical_difficulty)
+
+            outcome = "correct" if signal.correct else "wrong"
+            data[outcome] += 1
 
             # Categorize by empirical difficulty
             if signal.empirical_difficulty > AnalyticsServiceV2.EASY_DIFFICULTY:
-                if signal.correct:
-                    data["easy_correct"] += 1
-                else:
-                    data["easy_wrong"] += 1
+                data[f"easy_{outcome}"] += 1
             elif signal.empirical_difficulty < AnalyticsServiceV2.HARD_DIFFICULTY:
-                if signal.correct:
-                    data["hard_correct"] += 1
-                else:
-                    data["hard_wrong"] += 1
+                data[f"hard_{outcome}"] += 1
             else:
-                if signal.correct:
-                    data["medium_correct"] += 1
-                else:
-                    data["medium_wrong"] += 1
+                data[f"medium_{outcome}"] += 1
 
         # Calculate mathematical mastery
         mastery_list = []
@@ -176,7 +166,8 @@ class AnalyticsServiceV2:
 
             # Mathematical formula: weighted_avg(correctness × difficulty × recency)
             mastery_score = AnalyticsServiceV2._calculate_weighted_mastery(
-                data["attempts"]
+                data["outcomes"],
+                data["difficulties"]
             )
 
             mastery_list.append(TopicMastery(
@@ -198,38 +189,39 @@ class AnalyticsServiceV2:
         return mastery_list
 
     @staticmethod
-    def _calculate_weighted_mastery(attempts: List[Dict]) -> float:
+    def _calculate_weighted_mastery(outcomes: List[bool], difficulties: List[float]) -> float:
         """
         Mathematical formula: weighted_avg(correctness × difficulty × recency)
 
         - Correctness: 1 if correct, 0 if wrong
         - Difficulty weight: harder questions count more
         - Recency: recent attempts weigh more (exponential decay)
+
+        outcomes and difficulties are parallel per-attempt lists, oldest first.
         """
-        if not attempts:
+        if not outcomes:
             return 0.0
 
         total_weight = 0.0
         weighted_sum = 0.0
 
-        now = datetime.utcnow()
-
-        for i, attempt in enumerate(attempts):
-            # Correctness score
-            correctness = 1.0 if attempt["correct"] else 0.0
+        # Recency weight: exponential decay (half-life = 5 attempts), applied
+        # newest first so each older attempt is one multiply instead of an exp
+        recency_weight = 1.0
 
+        for correct, difficulty in zip(reversed(outcomes), reversed(difficulties)):
             # Difficulty weight: inverse of empirical difficulty
             # Hard questions (low success rate) weight more
-            difficulty_weight = 1.0 - attempt["difficulty"]
-
-            # Recency weight: exponential decay (half-life = 5 attempts)
-            recency_weight = math.exp(-0.14 * (len(attempts) - i - 1))
+            difficulty_weight = 1.0 - difficulty
 
             # Combined weight
             weight = difficulty_weight * recency_weight
-            weighted_sum += correctness * weight
+            if correct:
+                weighted_sum += weight
             total_weight += weight
 
+            recency_weight *= RECENCY_DECAY
+
         return weighted_sum / total_weight if total_weight > 0 else 0.0
 
     @staticmethod
@@ -272,7 +264,7 @@ class AnalyticsServiceV2:
             scores = topic_scores.get(mastery.topic, [])
             confidence_penalty = AnalyticsServiceV2._calculate_confidence_penalty(
                 scores,
-                signals
+                signal_by_id
             )
 
             # Final priority = weakness × exposure × confidence_penalty
@@ -300,26 +292,29 @@ class AnalyticsServiceV2:
     @staticmethod
     def _calculate_confidence_penalty(
         scores: List[CognitiveScores],
-        signals: List[BehavioralSignals]
+        signal_by_id: Dict[str, BehavioralSignals]
     ) -> float:
-        """Calculate confidence penalty from behavioral signals"""
+        """Calculate confidence penalty from behavioral signals, keyed by question id"""
         if not scores:
             return 1.0
 
-        signal_by_id = {s.question_id: s for s in signals}
-
         # Base penalty
         penalty = 1.0
 
+        # Confusion and marked-tricky counts in one pass over the scores
+        total_confusion = 0.0
+        marked_count = 0
+        for score in scores:
+            total_confusion += score.confusion_score
+            signal = signal_by_id.get(score.question_id)
+            if signal and signal.marked_tricky:
+                marked_count += 1
+
         # High confusion/hesitation increases penalty
-        avg_confusion = sum(s.confusion_score for s in scores) / len(scores)
+        avg_confusion = total_confusion / len(scores)
         penalty += avg_confusion * 0.5
 
         # Marked tricky increases penalty
-        marked_count = sum(
-            1 for s in scores
-            if signal_by_id.get(s.question_id) and signal_by_id[s.question_id].marked_tricky
-        )
         if marked_count > 0:
             penalty += 0.3 * (marked_count / len(scores))
 
@@ -335,12 +330,19 @@ class AnalyticsServiceV2:
         if mastery.easy_wrong > mastery.easy_correct:
             return f"Critical gap in {mastery.topic} fundamentals - review basics first"
 
-        avg_knowledge_gap = sum(s.knowledge_gap_score for s in scores) / len(scores) if scores else 0
+        # Knowledge gap and confusion totals in one pass over the scores
+        total_knowledge_gap = 0.0
+        total_confusion = 0.0
+        for score in scores:
+            total_knowledge_gap += score.knowledge_gap_score
+            total_confusion += score.confusion_score
+
+        avg_knowledge_gap = total_knowledge_gap / len(scores) if scores else 0
 
         if avg_knowledge_gap > 0.5:
             return f"Struggling with basic {mastery.topic} concepts - focused review needed"
 
-        avg_confusion = sum(s.confusion_score for s in scores) / len(scores) if scores else 0
+        avg_confusion = total_confusion / len(scores) if scores else 0
 
         if avg_confusion > 0.6:
             return f"High confusion in {mastery.topic} - try different explanations or examples"
@@ -55,15 +55,18 @@ class QuestionSelectionService:
         if difficulty_levels:
             query["difficulty"] = {"$in": difficulty_levels}
 
-        # Get all available (non-mastered) questions
-        cursor = db.questions.find(query)
-        all_questions = await cursor.to_list(length=1000)
-
-        # Prioritize questions by usage
-        prioritized = QuestionSelectionService._prioritize_questions(all_questions)
-
-        # Take the needed amount
-        selected = prioritized[:num_needed]
+        # Rank and take the needed amount on the server instead of loading
+        # every candidate question into Python
+        pipeline = [
+            {"$match": query},
+            {"$addFields": {
+                "_priority": QuestionSelectionService._priority_expression()
+            }},
+            {"$sort": {"_priority": 1, "last_used_at": 1, "_id": 1}},
+            {"$limit": num_needed},
+            {"$project": {"_priority": 0}}
+        ]
+        selected = await db.questions.aggregate(pipeline).to_list(length=num_needed)
 
         # Determine if we need to generate more
         needs_generation = len(selected) < num_needed
@@ -71,38 +74,33 @@ class QuestionSelectionService:
         return selected, needs_generation
 
     @staticmethod
-    def _prioritize_questions(questions: List[Dict]) -> List[Dict]:
+    def _priority_expression() -> Dict:
         """
-        Sort questions by priority (smart reuse strategy)
+        Aggregation expression ranking questions (smart reuse strategy)
 
         Priority Order:
         1. Never answered (times_answered = 0)
         2. Answered wrong more than correct (times_correct < times_answered)
         3. Answered correct but only once (times_correct = 1)
-        4. Least recently used (older last_used_at)
+        4. Least recently used (older last_used_at, sorted separately)
         """
+        times_answered = {"$ifNull": ["$times_answered", 0]}
+        times_correct = {"$ifNull": ["$times_correct", 0]}
 
-        def priority_score(q: Dict) -> tuple:
-            times_answered = q.get("times_answered", 0)
-            times_correct = q.get("times_correct", 0)
-            last_used = q.get("last_used_at", datetime.min)
-
-            # Never answered = highest priority (0)
-            if times_answered == 0:
-                return (0, last_used)
-
-            # Answered wrong more than correct = high priority (1)
-            if times_correct < times_answered:
-                return (1, last_used)
-
-            # Answered correct once = medium priority (2)
-            if times_correct == 1:
-                return (2, last_used)
-
-            # Everything else = lower priority (3)
-            return (3, last_used)
-
-        return sorted(questions, key=priority_score)
+        return {
+            "$switch": {
+                "branches": [
+                    # Never answered = highest priority (0)
+                    {"case": {"$eq": [times_answered, 0]}, "then": 0},
+                    # Answered wrong more than correct = high priority (1)
+                    {"case": {"$lt": [times_correct, times_answered]}, "then": 1},
+                    # Answered correct once = medium priority (2)
+                    {"case": {"$eq": [times_correct, 1]}, "then": 2}
+                ],
+                # Everything else = lower priority (3)
+                "default": 3
+            }
+        }
 
     @staticmethod
     async def mark_questions_used(
@@ -117,45 +115,6 @@ class QuestionSelectionService:
             {"$set": {"last_used_at": datetime.utcnow()}}
         )
 
-    @staticmethod
-    async def update_question_performance(
-        question_id: str,
-        is_correct: bool,
-        db = None
-    ):
-        """
-        Update question performance after being answered
-
-        Increments:
-        - times_answered (always)
-        - times_correct (if correct)
-
-        Updates:
-        - is_mastered (if answered correctly 2+ times)
-        """
-        update = {
-            "$inc": {
-                "times_answered": 1,
-                "times_correct": 1 if is_correct else 0
-            }
-        }
-
-        # Update the question
-        result = await db.questions.find_one_and_update(
-            {"_id": ObjectId(question_id)},
-            update,
-            return_document=True
-        )
-
-        # Check if it should be marked as mastered
-        if result:
-            times_correct = result.get("times_correct", 0)
-            if times_correct >= 2 and not result.get("is_mastered", False):
-                await db.questions.update_one(
-                    {"_id": ObjectId(question_id)},
-                    {"$set": {"is_mastered": True}}
-                )
-
     @staticmethod
     async def get_question_pool_stats(
         document_id: str,
@@ -178,43 +137,43 @@ class QuestionSelectionService:
             "user_id": ObjectId(user_id)
         }
 
-        total = await db.questions.count_documents(query_base)
-
-        # Backwards compatible queries - handle old questions without tracking fields
-        available = await db.questions.count_documents({
-            **query_base,
+        # Backwards compatible filters - handle old questions without tracking fields
+        not_mastered = {
             "$or": [
                 {"is_mastered": False},
                 {"is_mastered": {"$exists": False}}
             ]
-        })
+        }
 
-        never_answered = await db.questions.count_documents({
-            **query_base,
-            "$or": [
-                {"times_answered": 0},
-                {"times_answered": {"$exists": False}}
-            ]
-        })
+        buckets = {
+            "total": {},
+            "available": not_mastered,
+            "never_answered": {
+                "$or": [
+                    {"times_answered": 0},
+                    {"times_answered": {"$exists": False}}
+                ]
+            },
+            "needs_practice": {
+                "$expr": {"$lt": ["$times_correct", "$times_answered"]},
+                **not_mastered
+            },
+            "mastered": {"is_mastered": True}
+        }
 
-        needs_practice = await db.questions.count_documents({
-            **query_base,
-            "$expr": {"$lt": ["$times_correct", "$times_answered"]},
-            "$or": [
-                {"is_mastered": False},
-                {"is_mastered": {"$exists": False}}
-            ]
-        })
+        # Count every bucket in a single pass over the document's questions
+        pipeline = [
+            {"$match": query_base},
+            {"$facet": {
+                name: [{"$match": bucket_filter}, {"$count": "n"}]
+                for name, bucket_filter in buckets.items()
+            }}
+        ]
 
-        mastered = await db.questions.count_documents({
-            **query_base,
-            "is_mastered": True
-        })
+        result = await db.questions.aggregate(pipeline).to_list(length=1)
+        facets = result[0] if result else {}
 
         return {
-            "total": total,
-            "available": available,
-            "never_answered": never_answered,
-            "needs_practice": needs_practice,
-            "mastered": mastered
+            name: facets[name][0]["n"] if facets.get(name) else 0
+            for name in buckets
         }
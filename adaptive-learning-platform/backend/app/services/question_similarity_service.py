@@ -1,14 +1,59 @@
 """
 Question similarity and management service.
 """
-from typing import List, Dict
+from typing import List, Dict, Optional, AsyncIterator
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from app.utils.answers import normalize_answer
 import re
-from collections import Counter
+import random
+import hashlib
+from collections import Counter, defaultdict
 import math
 
 
+# MinHash parameters for near-duplicate detection. 16 bands of 4 rows put the
+# LSH candidate threshold around 0.5 Jaccard; candidates are then confirmed
+# against DUPLICATE_THRESHOLD using the full signature.
+MINHASH_NUM_PERM = 64
+MINHASH_BANDS = 16
+DUPLICATE_THRESHOLD = 0.85
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(1)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(MINHASH_NUM_PERM)
+]
+
+
+class MinHashLSH:
+    """In-memory LSH index over MinHash signatures."""
+
+    def __init__(self, threshold: float = DUPLICATE_THRESHOLD, bands: int = MINHASH_BANDS):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = MINHASH_NUM_PERM // bands
+        self.buckets = defaultdict(list)
+
+    def _band_keys(self, signature: List[int]):
+        for b in range(self.bands):
+            start = b * self.rows
+            yield b, tuple(signature[start:start + self.rows])
+
+    def insert(self, signature: List[int]):
+        """Add a signature to the index."""
+        for key in self._band_keys(signature):
+            self.buckets[key].append(signature)
+
+    def is_duplicate(self, signature: List[int]) -> bool:
+        """Check whether a near-duplicate signature is already indexed."""
+        for key in self._band_keys(signature):
+            for candidate in self.buckets.get(key, ()):
+                if QuestionSimilarityService.minhash_similarity(signature, candidate) >= self.threshold:
+                    return True
+        return False
+
+
 class QuestionSimilarityService:
     """Service for question similarity detection and management."""
 
@@ -19,6 +64,54 @@ class QuestionSimilarityService:
         tokens = re.findall(r'\w+', text.lower())
         return tokens
 
+    @staticmethod
+    def minhash_signature(text: str) -> List[int]:
+        """Compute a MinHash signature over word unigrams and bigrams."""
+        tokens = QuestionSimilarityService.tokenize(text)
+        shingles = set(tokens)
+        shingles.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+
+        if not shingles:
+            return [_MERSENNE_PRIME] * MINHASH_NUM_PERM
+
+        hashes = [
+            int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "big")
+            for s in shingles
+        ]
+
+        return [
+            min((a * h + b) % _MERSENNE_PRIME for h in hashes)
+            for a, b in _PERMUTATIONS
+        ]
+
+    @staticmethod
+    def minhash_similarity(sig1: List[int], sig2: List[int]) -> float:
+        """Estimate Jaccard similarity from two MinHash signatures."""
+        matches = sum(1 for a, b in zip(sig1, sig2) if a == b)
+        return matches / MINHASH_NUM_PERM
+
+    @staticmethod
+    async def build_minhash_index(
+        db: AsyncIOMotorDatabase,
+        document_id: str
+    ) -> MinHashLSH:
+        """Build an LSH index from the questions already stored for a document."""
+        lsh = MinHashLSH()
+
+        cursor = db.questions.find(
+            {"document_id": ObjectId(document_id)},
+            {"question_text": 1, "minhash": 1}
+        )
+        async for question in cursor:
+            signature: Optional[List[int]] = question.get("minhash")
+            if not signature:
+                signature = QuestionSimilarityService.minhash_signature(
+                    question.get("question_text", "")
+                )
+            lsh.insert(signature)
+
+        return lsh
+
     @staticmethod
     def cosine_similarity(text1: str, text2: str) -> float:
         """Calculate cosine similarity between two texts."""
@@ -146,6 +239,7 @@ class QuestionSimilarityService:
                 "topic": q_data.get("topic", "General"),
                 "question_text": q_data["question_text"],
                 "correct_answer": q_data["correct_answer"],
+                "normalized_answer": normalize_answer(q_data["correct_answer"]),
                 "explanation": q_data.get("explanation", ""),
                 "options": q_data.get("options", []),
                 "source_section": q_data.get("source_section", ""),
@@ -161,28 +255,50 @@ class QuestionSimilarityService:
 
         return 0
 
+    EXPORT_FIELDS = [
+        "question_id",
+        "topic",
+        "difficulty",
+        "question_type",
+        "question_text",
+        "options",
+        "correct_answer",
+        "explanation",
+        "source_section"
+    ]
+
+    @staticmethod
+    def _export_row(q: Dict) -> Dict:
+        """Convert a question document to its export format."""
+        return {
+            "question_id": str(q["_id"]),
+            "topic": q.get("topic"),
+            "difficulty": q.get("difficulty"),
+            "question_type": q.get("question_type"),
+            "question_text": q.get("question_text"),
+            "options": q.get("options", []),
+            "correct_answer": q.get("correct_answer"),
+            "explanation": q.get("explanation"),
+            "source_section": q.get("source_section")
+        }
+
+    @staticmethod
+    async def iter_export_questions(
+        db: AsyncIOMotorDatabase,
+        document_id: str
+    ) -> AsyncIterator[Dict]:
+        """Yield export rows for a document's questions as they are read."""
+        cursor = db.questions.find({"document_id": document_id})
+        async for q in cursor:
+            yield QuestionSimilarityService._export_row(q)
+
     @staticmethod
     async def export_questions(
         db: AsyncIOMotorDatabase,
         document_id: str
     ) -> List[Dict]:
         """Export all questions for a document."""
-        cursor = db.questions.find({"document_id": document_id})
-        questions = await cursor.to_list(length=10000)
-
-        # Prepare export format
-        export_data = []
-        for q in questions:
-            export_data.append({
-                "question_id": str(q["_id"]),
-                "topic": q.get("topic"),
-                "difficulty": q.get("difficulty"),
-                "question_type": q.get("question_type"),
-                "question_text": q.get("question_text"),
-                "options": q.get("options", []),
-                "correct_answer": q.get("correct_answer"),
-                "explanation": q.get("explanation"),
-                "source_section": q.get("source_section")
-            })
-
-        return export_data
+        return [
+            row async for row in
+            QuestionSimilarityService.iter_export_questions(db, document_id)
+        ]
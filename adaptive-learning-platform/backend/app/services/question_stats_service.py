@@ -1,9 +1,18 @@
 
-from typing import Optional
+import asyncio
+from typing import Optional, Dict, List, Tuple
 from bson import ObjectId
+from pymongo import UpdateOne
 from app.models.analytics import QuestionStatistics
 from app.core.database import get_database
 
+# Answer stats are coalesced for up to this many items or this long
+STATS_BATCH_SIZE = 100
+STATS_FLUSH_INTERVAL = 0.2  # seconds
+
+# Queued by stop() so the worker flushes the batch it holds and exits
+_STOP = object()
+
 
 class QuestionStatsService:
     """Manage empirical question difficulty"""
@@ -23,35 +32,6 @@ class QuestionStatsService:
             return QuestionStatistics(**stats_doc)
         return None
 
-    @staticmethod
-    async def update_question_stats(
-        question_id: str,
-        correct: bool,
-        time_taken: int,
-        db
-    ):
-        """Update question statistics after an attempt"""
-
-        stats_doc = await db.question_statistics.find_one({
-            "question_id": question_id
-        })
-
-        if stats_doc:
-            # Update existing stats
-            stats = QuestionStatistics(**stats_doc)
-            stats.update_from_attempt(correct, time_taken)
-
-            await db.question_statistics.update_one(
-                {"question_id": question_id},
-                {"$set": stats.dict()}
-            )
-        else:
-            # Create new stats (bootstrap at 0.5 difficulty)
-            stats = QuestionStatistics(question_id=question_id)
-            stats.update_from_attempt(correct, time_taken)
-
-            await db.question_statistics.insert_one(stats.dict())
-
     @staticmethod
     async def get_empirical_difficulty(
         question_id: str,
@@ -66,3 +46,172 @@ class QuestionStatsService:
 
         # Bootstrap at 0.5 if no data yet
         return 0.5
+
+    @staticmethod
+    def aggregate_attempts(attempts: List[Tuple[str, bool, int]]) -> Dict[str, Dict[str, int]]:
+        """Collapse (question_id, correct, time_taken) attempts into per-question totals"""
+        totals: Dict[str, Dict[str, int]] = {}
+        for question_id, correct, time_taken in attempts:
+            agg = totals.setdefault(question_id, {"n": 0, "correct": 0, "time": 0})
+            agg["n"] += 1
+            agg["correct"] += 1 if correct else 0
+            agg["time"] += time_taken
+        return totals
+
+    @staticmethod
+    def statistics_update(question_id: str, agg: Dict[str, int]) -> UpdateOne:
+        """
+        Upsert applying a batch of attempts to question_statistics.
+
+        Pipeline form of QuestionStatistics.update_from_attempt: every
+        expression in the $set reads the pre-batch values.
+        """
+        total = {"$ifNull": ["$total_attempts", 0]}
+        correct = {"$ifNull": ["$correct_attempts", 0]}
+        new_total = {"$add": [total, agg["n"]]}
+
+        return UpdateOne(
+            {"question_id": question_id},
+            [{"$set": {
+                "total_attempts": new_total,
+                "correct_attempts": {"$add": [correct, agg["correct"]]},
+                "empirical_difficulty": {
+                    "$divide": [{"$add": [correct, agg["correct"]]}, new_total]
+                },
+                "avg_time_taken": {
+                    "$divide": [
+                        {"$add": [
+                            {"$multiply": [{"$ifNull": ["$avg_time_taken", 0]}, total]},
+                            agg["time"]
+                        ]},
+                        new_total
+                    ]
+                },
+                "last_updated": "$$NOW"
+            }}],
+            upsert=True
+        )
+
+    @staticmethod
+    async def apply_attempts(attempts: List[Tuple[str, bool, int]], db):
+        """Write a batch of attempts with one bulk_write per collection"""
+        totals = QuestionStatsService.aggregate_attempts(attempts)
+        if not totals:
+            return
+
+        async def update_performance():
+            # Question performance tracking (for smart reuse)
+            await db.questions.bulk_write(
+                [
+                    UpdateOne(
+                        {"_id": ObjectId(qid)},
+                        {"$inc": {"times_answered": agg["n"], "times_correct": agg["correct"]}}
+                    )
+                    for qid, agg in totals.items()
+                ],
+                ordered=False
+            )
+
+            # Mastered once answered correctly 2+ times
+            await db.questions.update_many(
+                {
+                    "_id": {"$in": [ObjectId(qid) for qid in totals]},
+                    "times_correct": {"$gte": 2},
+                    "is_mastered": {"$ne": True}
+                },
+                {"$set": {"is_mastered": True}}
+            )
+
+        # The two collections are independent; write them concurrently
+        await asyncio.gather(
+            db.question_statistics.bulk_write(
+                [QuestionStatsService.statistics_update(qid, agg) for qid, agg in totals.items()],
+                ordered=False
+            ),
+            update_performance()
+        )
+
+
+class QuestionStatsBatcher:
+    """Queue answer stats off the request path and flush them in batches"""
+
+    def __init__(
+        self,
+        batch_size: int = STATS_BATCH_SIZE,
+        flush_interval: float = STATS_FLUSH_INTERVAL
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start the flush worker on the running event loop."""
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the worker and write whatever is still queued."""
+        if self._worker is None:
+            return
+
+        # Records from here on are written directly by record()
+        worker, self._worker = self._worker, None
+
+        # The worker writes the batch it is holding when it reaches the sentinel
+        self._queue.put_nowait(_STOP)
+        await worker
+
+        pending = []
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        await self._flush(pending)
+
+    async def record(self, question_id: str, correct: bool, time_taken: int):
+        """Queue one answered question; written directly if the worker is not running."""
+        if self._worker is None:
+            await self._flush([(question_id, correct, time_taken)])
+            return
+
+        self._queue.put_nowait((question_id, correct, time_taken))
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is _STOP:
+                return
+
+            batch = [item]
+            deadline = loop.time() + self.flush_interval
+
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[Tuple[str, bool, int]]):
+        db = await get_database()
+        if not batch or db is None:
+            return
+
+        try:
+            await QuestionStatsService.apply_attempts(batch, db)
+        except Exception as e:
+            print(f"Warning: Could not write question stats: {e}")
+
+
+# Global batcher instance
+question_stats_batcher = QuestionStatsBatcher()
@@ -28,10 +28,22 @@ class SecurityService:
 
     @staticmethod
     def verify_2fa_token(secret: str, token: str) -> bool:
-        """Verify a 2FA token."""
+        """Verify a 2FA token (pyotp compares in constant time)."""
         totp = pyotp.TOTP(secret)
         return totp.verify(token, valid_window=1)
 
+    @staticmethod
+    async def get_2fa_secret(
+        db: AsyncIOMotorDatabase,
+        user_id: str
+    ) -> Optional[str]:
+        """Get the 2FA secret for a user with 2FA enabled."""
+        tfa = await db.two_factor_auth.find_one(
+            {"user_id": user_id, "enabled": True},
+            {"secret": 1}
+        )
+        return tfa["secret"] if tfa else None
+
     @staticmethod
     def generate_backup_codes(count: int = 8) -> list[str]:
         """Generate backup codes for 2FA."""
@@ -126,24 +138,20 @@ class SecurityService:
     ) -> Optional[dict]:
         """Verify an API key and return user info."""
         key_hash = hashlib.sha256(api_key.encode()).hexdigest()
+        now = datetime.utcnow()
 
-        api_key_obj = await db.api_keys.find_one({
-            "key_hash": key_hash,
-            "revoked": False
-        })
-
-        if not api_key_obj:
-            return None
-
-        # Check expiration
-        if api_key_obj.get("expires_at") and api_key_obj["expires_at"] < datetime.utcnow():
-            return None
-
-        # Update usage
-        await db.api_keys.update_one(
-            {"_id": api_key_obj["_id"]},
+        # Look up, check expiration and record usage in a single round trip
+        api_key_obj = await db.api_keys.find_one_and_update(
+            {
+                "key_hash": key_hash,
+                "revoked": False,
+                "$or": [
+                    {"expires_at": None},
+                    {"expires_at": {"$gte": now}}
+                ]
+            },
             {
-                "$set": {"last_used": datetime.utcnow()},
+                "$set": {"last_used": now},
                 "$inc": {"uses_count": 1}
             }
         )
@@ -189,6 +189,64 @@ class SpacedRepetitionService:
 
         return queue_items
 
+    @staticmethod
+    async def create_review_session(
+        db: AsyncIOMotorDatabase,
+        user_id: str,
+        document_id: Optional[str] = None,
+        max_reviews: int = 20
+    ) -> Optional[dict]:
+        """
+        Create a review session from due reviews server-side.
+
+        Due reviews are grouped into a session document and merged into
+        review_sessions by a single aggregation, so review documents are
+        never shipped to the application.
+
+        Returns:
+            The created session document, or None if no reviews are due
+        """
+        query = {
+            "user_id": user_id,
+            "next_review_date": {"$lte": datetime.utcnow()}
+        }
+
+        if document_id:
+            query["document_id"] = document_id
+
+        session_id = ObjectId()
+
+        pipeline = [
+            {"$match": query},
+            {"$sort": {"next_review_date": 1}},
+            {"$limit": max_reviews},
+            {"$group": {
+                "_id": None,
+                "review_ids": {"$push": {"$toString": "$_id"}},
+                "total_reviews": {"$sum": 1}
+            }},
+            # Request values are wrapped in $literal so a leading "$" is
+            # never read as a field path or operator
+            {"$set": {
+                "_id": session_id,
+                "user_id": {"$literal": user_id},
+                "document_id": {"$literal": document_id},
+                "started_at": "$$NOW",
+                "completed_at": None,
+                "completed_reviews": 0,
+                "quality_sum": 0
+            }},
+            {"$merge": {
+                "into": "review_sessions",
+                "whenMatched": "fail",
+                "whenNotMatched": "insert"
+            }}
+        ]
+
+        await db.reviews.aggregate(pipeline).to_list(length=None)
+
+        return await db.review_sessions.find_one({"_id": session_id})
+
     @staticmethod
     async def get_review_schedule(
         db: AsyncIOMotorDatabase,
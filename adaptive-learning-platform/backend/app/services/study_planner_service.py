@@ -2,7 +2,7 @@
 Study plan generation service.
 """
 from datetime import datetime, timedelta
-from typing import List, Dict
+from typing import List, Dict, Optional
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
@@ -132,15 +132,31 @@ class StudyPlannerService:
 
         return plan
 
+    @staticmethod
+    def _plan_filter(plan_id: str, user_id: Optional[str] = None) -> Dict:
+        """Query for a plan, restricted to its owner when user_id is given."""
+        query = {"_id": ObjectId(plan_id)}
+        if user_id is not None:
+            query["user_id"] = user_id
+        return query
+
     @staticmethod
     async def get_next_session(
         db: AsyncIOMotorDatabase,
-        plan_id: str
-    ) -> Dict:
-        """Get the next recommended session from a study plan."""
-        plan_data = await db.study_plans.find_one({"_id": ObjectId(plan_id)})
+        plan_id: str,
+        user_id: Optional[str] = None
+    ) -> Optional[Dict]:
+        """
+        Get the next recommended session from a study plan.
+
+        Returns None if the plan does not exist (or is not owned by user_id).
+        """
+        plan_data = await db.study_plans.find_one(
+            StudyPlannerService._plan_filter(plan_id, user_id),
+            {"sessions": 1}
+        )
         if not plan_data:
-            return {"message": "Study plan not found"}
+            return None
 
         # Find first incomplete session
         for session_data in plan_data.get("sessions", []):
@@ -159,34 +175,50 @@ class StudyPlannerService:
     async def complete_session(
         db: AsyncIOMotorDatabase,
         plan_id: str,
-        session_number: int
-    ):
-        """Mark a study session as completed."""
+        session_number: int,
+        user_id: Optional[str] = None
+    ) -> bool:
+        """
+        Mark a study session as completed.
+
+        Returns False if no matching plan/session was found.
+        """
+        now = datetime.utcnow()
+
         # Update the specific session
-        await db.study_plans.update_one(
+        result = await db.study_plans.update_one(
             {
-                "_id": ObjectId(plan_id),
+                **StudyPlannerService._plan_filter(plan_id, user_id),
                 "sessions.session_number": session_number
             },
             {
                 "$set": {
                     "sessions.$.completed": True,
-                    "sessions.$.completed_at": datetime.utcnow()
+                    "sessions.$.completed_at": now,
+                    "updated_at": now
                 },
-                "$inc": {"completed_sessions": 1},
-                "$set": {"updated_at": datetime.utcnow()}
+                "$inc": {"completed_sessions": 1}
             }
         )
 
+        return result.matched_count > 0
+
     @staticmethod
     async def get_progress(
         db: AsyncIOMotorDatabase,
-        plan_id: str
-    ) -> Dict:
-        """Get study plan progress."""
-        plan_data = await db.study_plans.find_one({"_id": ObjectId(plan_id)})
+        plan_id: str,
+        user_id: Optional[str] = None
+    ) -> Optional[Dict]:
+        """
+        Get study plan progress.
+
+        Returns None if the plan does not exist (or is not owned by user_id).
+        """
+        plan_data = await db.study_plans.find_one(
+            StudyPlannerService._plan_filter(plan_id, user_id)
+        )
         if not plan_data:
-            return {"message": "Study plan not found"}
+            return None
 
         completed = plan_data.get("completed_sessions", 0)
         total = plan_data.get("total_sessions", 1)
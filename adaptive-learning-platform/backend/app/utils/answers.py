@@ -0,0 +1,8 @@
+"""
+Answer comparison helpers.
+"""
+
+
+def normalize_answer(answer: str) -> str:
+    """Canonical form used to compare a submitted answer with the correct one"""
+    return answer.strip().lower()
@@ -0,0 +1,24 @@
+"""
+JSON response classes.
+"""
+from typing import Any
+
+import orjson
+from fastapi.responses import ORJSONResponse
+
+
+class MongoJSONResponse(ORJSONResponse):
+    """
+    ORJSONResponse for bodies built straight from Mongo documents.
+
+    Routes returning it skip FastAPI's jsonable_encoder and response_model
+    validation, so bodies must already carry every field of the declared
+    model (defaults included); ObjectIds are written as strings.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=str,
+            option=orjson.OPT_NON_STR_KEYS
+        )
@@ -0,0 +1,70 @@
+"""
+Streaming JSON response helpers.
+"""
+from typing import Any, AsyncIterator, Dict
+
+import orjson
+from fastapi.responses import StreamingResponse
+
+
+async def stream_json_list(
+    head: Dict[str, Any],
+    list_key: str,
+    cursor,
+    count_key: str
+) -> AsyncIterator[bytes]:
+    """
+    Stream {**head, list_key: [...], count_key: n} as the cursor yields documents.
+
+    The list is never buffered; its length is written after the last item.
+    """
+    opening = orjson.dumps(head, default=str)[:-1]
+    if head:
+        opening += b","
+    yield opening + orjson.dumps(list_key) + b":["
+
+    count = 0
+    async for doc in cursor:
+        if count:
+            yield b"," + orjson.dumps(doc, default=str)
+        else:
+            yield orjson.dumps(doc, default=str)
+        count += 1
+
+    yield b"]," + orjson.dumps(count_key) + b":" + orjson.dumps(count) + b"}"
+
+
+async def _prepend(first: Any, docs: AsyncIterator) -> AsyncIterator:
+    """Yield first, then the rest of docs"""
+    yield first
+    async for doc in docs:
+        yield doc
+
+
+async def stream_json_list_response(
+    head: Dict[str, Any],
+    list_key: str,
+    cursor,
+    count_key: str
+) -> StreamingResponse:
+    """
+    StreamingResponse of stream_json_list, started only once the cursor has
+    returned its first batch.
+
+    Errors running the query (bad filter, lost connection) are raised here,
+    before the 200 status is sent, so they reach the route's error handling.
+    A failure while reading a later batch can only cut the stream short: the
+    client gets a 200 with an incomplete JSON body.
+    """
+    docs = cursor.__aiter__()
+    try:
+        first = await docs.__anext__()
+    except StopAsyncIteration:
+        items = docs
+    else:
+        items = _prepend(first, docs)
+
+    return StreamingResponse(
+        stream_json_list(head, list_key, items, count_key),
+        media_type="application/json"
+    )
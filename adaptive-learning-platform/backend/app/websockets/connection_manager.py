@@ -1,7 +1,10 @@
 """
 WebSocket connection manager.
 """
+import asyncio
 from typing import Dict, List
+
+import orjson
 from fastapi import WebSocket
 
 
@@ -40,14 +43,24 @@ class ConnectionManager:
     async def broadcast(self, message: dict, connection_type: str, connection_id: str):
         """Broadcast a message to all connections of a specific type/ID."""
         key = f"{connection_type}:{connection_id}"
+        connections = list(self.active_connections.get(key, ()))
 
-        if key in self.active_connections:
-            for connection in self.active_connections[key]:
-                try:
-                    await connection.send_json(message)
-                except:
-                    # Remove dead connections
-                    self.disconnect(connection, connection_type, connection_id)
+        if not connections:
+            return
+
+        # Serialize once and send to every connection concurrently; sent as
+        # text frames so clients see the same messages as with send_json.
+        # Values orjson can't encode natively (e.g. ObjectId) are sent as strings.
+        payload = orjson.dumps(message, default=str).decode()
+        results = await asyncio.gather(
+            *(connection.send_text(payload) for connection in connections),
+            return_exceptions=True
+        )
+
+        # Remove dead connections
+        for connection, result in zip(connections, results):
+            if isinstance(result, Exception):
+                self.disconnect(connection, connection_type, connection_id)
 
 
 # Global connection manager
@@ -0,0 +1,50 @@
+"""
+One-off backfill: store normalized_answer on questions created before it existed.
+
+Answers are normalized in Python (not $toLower/$trim) so grading matches
+normalize_answer exactly. Questions without a correct_answer are skipped
+rather than given an empty normalized answer.
+Run once from the backend directory:
+
+    python -m scripts.backfill_normalized_answers
+"""
+import asyncio
+
+from pymongo import UpdateOne
+
+from app.core.database import connect_to_mongo, close_mongo_connection, db
+from app.utils.answers import normalize_answer
+
+
+async def backfill_normalized_answers():
+    await connect_to_mongo()
+    try:
+        updated = 0
+        batch = []
+        cursor = db.db.questions.find(
+            {"normalized_answer": {"$exists": False}, "correct_answer": {"$nin": [None, ""]}},
+            {"correct_answer": 1}
+        )
+
+        async for question in cursor:
+            batch.append(UpdateOne(
+                {"_id": question["_id"]},
+                {"$set": {"normalized_answer": normalize_answer(question["correct_answer"])}}
+            ))
+
+            if len(batch) >= 1000:
+                result = await db.db.questions.bulk_write(batch, ordered=False)
+                updated += result.modified_count
+                batch = []
+
+        if batch:
+            result = await db.db.questions.bulk_write(batch, ordered=False)
+            updated += result.modified_count
+
+        print(f"Added normalized answers to {updated} existing questions")
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(backfill_normalized_answers())
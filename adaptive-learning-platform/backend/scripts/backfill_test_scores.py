@@ -0,0 +1,31 @@
+"""
+One-off backfill: store the TestScore on completed sessions that have none.
+
+Sessions completed before scores were stored at completion (and sessions
+marked after completion while marking unset the score) have no score field.
+Run once from the backend directory:
+
+    python -m scripts.backfill_test_scores
+"""
+import asyncio
+
+from app.core.database import connect_to_mongo, close_mongo_connection, db
+from app.db.scores import SCORE_EXPRESSION
+from app.models.test_session import TestStatus
+
+
+async def backfill_test_scores():
+    await connect_to_mongo()
+    try:
+        # Computed server-side in one update; {"score": None} matches missing or null
+        result = await db.db.test_sessions.update_many(
+            {"status": TestStatus.COMPLETED.value, "score": None},
+            [{"$set": {"score": SCORE_EXPRESSION}}]
+        )
+        print(f"Stored scores on {result.modified_count} completed sessions")
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(backfill_test_scores())
@@ -204,3 +204,142 @@ async def test_behavior_fingerprint_traits():
 
     # Risk taker should have high risk_taking score
     assert traits["risk_taking"] > 0.5
+
+
+@pytest.mark.unit
+@pytest.mark.analytics
+def test_session_topic_rows_single_pass():
+    """Test one pass over a session's answers counts every topic."""
+    from app.services.advanced_analytics_service import AdvancedAnalyticsService
+
+    session = {
+        "answers": [
+            {"question_id": "q1", "status": "correct", "hesitation_count": 2},
+            {"question_id": "q2", "status": "wrong"},
+            {"question_id": "q3", "status": "skipped"},
+            {"question_id": "q4", "status": "correct"},
+        ]
+    }
+    question_topics = {"q1": "CNNs", "q2": "CNNs", "q3": "Transformers"}
+
+    rows = AdvancedAnalyticsService._session_topic_rows(session, question_topics)
+
+    assert rows == {
+        "CNNs": {"correct": 1, "total": 2, "answered": 2, "hesitation": 2},
+        "Transformers": {"correct": 0, "total": 1, "answered": 0, "hesitation": 0}
+    }
+
+
+@pytest.mark.unit
+@pytest.mark.analytics
+def test_calculate_slope_closed_form():
+    """Test the closed-form slope matches a least-squares fit."""
+    from app.services.advanced_analytics_service import AdvancedAnalyticsService
+
+    assert AdvancedAnalyticsService._calculate_slope([0.5]) == 0.0
+    assert AdvancedAnalyticsService._calculate_slope([0.2, 0.4, 0.6, 0.8]) == pytest.approx(0.2)
+    assert AdvancedAnalyticsService._calculate_slope([0.5, 0.5, 0.5]) == pytest.approx(0.0)
+    assert AdvancedAnalyticsService._calculate_slope([1.0, 0.0, 1.0, 0.0]) == pytest.approx(-0.2)
+
+
+@pytest.mark.unit
+@pytest.mark.analytics
+def test_fit_decay_rate_least_squares():
+    """Test decay is fitted over all post-peak sessions, with a fallback signal."""
+    import math
+    from app.services.advanced_analytics_service import AdvancedAnalyticsService
+
+    peak = datetime(2024, 1, 1)
+    days = [0, 2, 5, 10]
+    masteries = [0.9 * math.exp(-0.05 * d) for d in days]
+    dates = [peak + timedelta(days=d) for d in days]
+
+    rate = AdvancedAnalyticsService._fit_decay_rate(masteries, dates)
+    assert rate == pytest.approx(0.05)
+
+    # Too few sessions after the peak, or zero mastery: use the two-point formula
+    assert AdvancedAnalyticsService._fit_decay_rate(masteries[:2], dates[:2]) is None
+    assert AdvancedAnalyticsService._fit_decay_rate([0.9, 0.5, 0.0], dates[:3]) is None
+
+
+@pytest.mark.unit
+@pytest.mark.analytics
+def test_forgetting_curve_round_trips_through_cache_payload():
+    """Test a cached forgetting curve rebuilds to the same result."""
+    from app.models.analytics import ForgettingCurveData
+    from app.services.advanced_analytics_service import AdvancedAnalyticsService
+
+    peak = datetime(2024, 1, 1)
+    rows = [
+        {"correct": 9, "total": 10, "completed_at": peak},
+        {"correct": 6, "total": 10, "completed_at": peak + timedelta(days=10)},
+    ]
+
+    curve = AdvancedAnalyticsService._forgetting_curve("CNNs", rows)
+
+    assert curve.peak_mastery == pytest.approx(0.9)
+    assert curve.days_since_peak == 10
+    assert curve.needs_review is True
+    assert ForgettingCurveData(**curve.model_dump(mode="json")) == curve
+
+
+@pytest.mark.unit
+@pytest.mark.analytics
+def test_identify_weakness_areas_pattern_counts():
+    """Test weakness patterns and priority from per-topic question buckets."""
+    from app.models.analytics import FailurePattern, TopicMastery
+    from app.services.analytics_service import AnalyticsService
+
+    questions = [
+        {"_id": "q1", "topic": "CNNs", "difficulty": "easy"},
+        {"_id": "q2", "topic": "CNNs", "difficulty": "hard"},
+        {"_id": "q3", "topic": "CNNs", "difficulty": "medium"},
+        {"_id": "q4", "topic": "RNNs", "difficulty": "easy"},
+    ]
+    patterns = {
+        "fast_wrong": ["q1", "q4"],
+        "slow_wrong": ["q2"],
+        "tricky_wrong": ["q2"],
+    }
+    mastery = TopicMastery(
+        topic="CNNs", total_attempts=3, correct_attempts=1, wrong_attempts=2,
+        mastery_score=0.33, mastery_percentage=33.0, avg_time_taken=40.0
+    )
+
+    [weakness] = AnalyticsService.identify_weakness_areas([mastery], patterns, questions)
+
+    assert weakness.question_ids == ["q1", "q2", "q3"]
+    assert weakness.failure_patterns == [
+        FailurePattern.FAST_WRONG,
+        FailurePattern.SLOW_WRONG,
+        FailurePattern.TRICKY_WRONG,
+        FailurePattern.EASY_WRONG,
+    ]
+    # (1*1 + 1*2 + 1*3 + 1*4) * 10
+    assert weakness.priority_score == 100
+
+
+@pytest.mark.unit
+@pytest.mark.analytics
+def test_weighted_mastery_recency_decay():
+    """Test weighted mastery matches the per-attempt exp(-0.14 * age) formula."""
+    import math
+    from app.services.analytics_service_v2 import AnalyticsServiceV2
+
+    attempts = [
+        {"correct": True, "difficulty": 0.2},
+        {"correct": False, "difficulty": 0.5},
+        {"correct": True, "difficulty": 0.9},
+        {"correct": False, "difficulty": 0.3},
+    ]
+    weights = [
+        (1.0 - a["difficulty"]) * math.exp(-0.14 * (len(attempts) - i - 1))
+        for i, a in enumerate(attempts)
+    ]
+    expected = sum(w for w, a in zip(weights, attempts) if a["correct"]) / sum(weights)
+
+    outcomes = [a["correct"] for a in attempts]
+    difficulties = [a["difficulty"] for a in attempts]
+
+    assert AnalyticsServiceV2._calculate_weighted_mastery(outcomes, difficulties) == pytest.approx(expected)
+    assert AnalyticsServiceV2._calculate_weighted_mastery([], []) == 0.0
@@ -0,0 +1,52 @@
+"""
+Tests for the WebSocket connection manager.
+"""
+import json
+
+import pytest
+from bson import ObjectId
+
+from app.websockets.connection_manager import ConnectionManager
+
+
+class _FakeWebSocket:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.sent = []
+
+    async def send_text(self, data: str):
+        if self.fail:
+            raise RuntimeError("connection closed")
+        self.sent.append(data)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_broadcast_sends_to_room_and_drops_dead_connections():
+    """Test every live connection gets the message and failed ones are removed."""
+    manager = ConnectionManager()
+    alive, dead, other_room = _FakeWebSocket(), _FakeWebSocket(fail=True), _FakeWebSocket()
+    manager.active_connections = {
+        "study_room:r1": [alive, dead],
+        "study_room:r2": [other_room]
+    }
+
+    await manager.broadcast({"type": "chat", "n": 1}, "study_room", "r1")
+
+    assert [json.loads(m) for m in alive.sent] == [{"type": "chat", "n": 1}]
+    assert other_room.sent == []
+    assert manager.active_connections["study_room:r1"] == [alive]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_broadcast_sends_non_json_values_as_strings():
+    """Test an ObjectId in the payload is sent as a string instead of failing the broadcast."""
+    manager = ConnectionManager()
+    ws = _FakeWebSocket()
+    manager.active_connections = {"study_room:r1": [ws]}
+    oid = ObjectId()
+
+    await manager.broadcast({"user_id": oid}, "study_room", "r1")
+
+    assert [json.loads(m) for m in ws.sent] == [{"user_id": str(oid)}]
@@ -0,0 +1,29 @@
+"""
+Tests for question similarity service.
+"""
+import pytest
+from app.services.question_similarity_service import QuestionSimilarityService, MinHashLSH
+
+
+@pytest.mark.unit
+def test_minhash_similarity():
+    """Test MinHash signatures estimate text overlap."""
+    sig1 = QuestionSimilarityService.minhash_signature("What is the main purpose of a unit test?")
+    sig2 = QuestionSimilarityService.minhash_signature("What is the main purpose of a unit test")
+    sig3 = QuestionSimilarityService.minhash_signature("Explain how garbage collection works in Python.")
+
+    # Same tokens should give identical signatures
+    assert QuestionSimilarityService.minhash_similarity(sig1, sig2) == 1.0
+
+    # Unrelated questions should be far apart
+    assert QuestionSimilarityService.minhash_similarity(sig1, sig3) < 0.3
+
+
+@pytest.mark.unit
+def test_minhash_lsh_duplicate_detection():
+    """Test LSH index flags near-duplicates only."""
+    lsh = MinHashLSH()
+    lsh.insert(QuestionSimilarityService.minhash_signature("Why use mocks in unit testing?"))
+
+    assert lsh.is_duplicate(QuestionSimilarityService.minhash_signature("Why use mocks in unit testing"))
+    assert not lsh.is_duplicate(QuestionSimilarityService.minhash_signature("What are pytest fixtures?"))
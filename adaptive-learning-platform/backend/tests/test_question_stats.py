@@ -0,0 +1,26 @@
+"""
+Tests for question stats service.
+"""
+import pytest
+from app.services.question_stats_service import QuestionStatsService
+
+
+@pytest.mark.unit
+def test_aggregate_attempts():
+    """Test attempts are collapsed into per-question totals."""
+    totals = QuestionStatsService.aggregate_attempts([
+        ("q1", True, 10),
+        ("q2", False, 30),
+        ("q1", False, 20),
+    ])
+
+    assert totals == {
+        "q1": {"n": 2, "correct": 1, "time": 30},
+        "q2": {"n": 1, "correct": 0, "time": 30},
+    }
+
+
+@pytest.mark.unit
+def test_aggregate_attempts_empty():
+    """Test an empty batch produces no writes."""
+    assert QuestionStatsService.aggregate_attempts([]) == {}
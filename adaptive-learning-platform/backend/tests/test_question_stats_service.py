@@ -0,0 +1,81 @@
+"""
+Tests for batched question statistics writes.
+"""
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from bson import ObjectId
+
+from app.services.question_stats_service import QuestionStatsBatcher, QuestionStatsService
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_apply_attempts_updates_statistics_and_mastery(test_db):
+    """Test one batch updates question_statistics, counters and is_mastered."""
+    seen, fresh = ObjectId(), ObjectId()
+    await test_db.questions.insert_many([
+        {"_id": seen, "times_answered": 3, "times_correct": 1, "is_mastered": False},
+        {"_id": fresh, "times_answered": 0, "times_correct": 0, "is_mastered": False},
+    ])
+    await test_db.question_statistics.insert_one({
+        "question_id": str(seen),
+        "total_attempts": 2,
+        "correct_attempts": 1,
+        "empirical_difficulty": 0.5,
+        "avg_time_taken": 30.0
+    })
+
+    await QuestionStatsService.apply_attempts([
+        (str(seen), True, 60),
+        (str(seen), False, 30),
+        (str(fresh), False, 10),
+    ], test_db)
+
+    stats = await test_db.question_statistics.find_one({"question_id": str(seen)})
+    assert stats["total_attempts"] == 4
+    assert stats["correct_attempts"] == 2
+    assert stats["empirical_difficulty"] == pytest.approx(0.5)
+    assert stats["avg_time_taken"] == pytest.approx((30.0 * 2 + 90) / 4)
+
+    # First attempts upsert a statistics document
+    new_stats = await test_db.question_statistics.find_one({"question_id": str(fresh)})
+    assert new_stats["total_attempts"] == 1
+    assert new_stats["correct_attempts"] == 0
+
+    seen_doc = await test_db.questions.find_one({"_id": seen})
+    assert (seen_doc["times_answered"], seen_doc["times_correct"]) == (5, 2)
+    assert seen_doc["is_mastered"] is True
+
+    fresh_doc = await test_db.questions.find_one({"_id": fresh})
+    assert (fresh_doc["times_answered"], fresh_doc["times_correct"]) == (1, 0)
+    assert fresh_doc["is_mastered"] is False
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_batcher_stop_writes_the_batch_in_progress():
+    """Test stop() writes items the worker already took off the queue."""
+    written = []
+
+    async def apply_attempts(attempts, db):
+        written.extend(attempts)
+
+    batcher = QuestionStatsBatcher(batch_size=100, flush_interval=60)
+
+    with patch(
+        "app.services.question_stats_service.get_database",
+        new=AsyncMock(return_value=object())
+    ), patch.object(QuestionStatsService, "apply_attempts", new=apply_attempts):
+        batcher.start()
+        await batcher.record("q1", True, 10)
+        await batcher.record("q2", False, 20)
+
+        # Let the worker move both items into its pending batch
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+        await batcher.stop()
+
+    assert written == [("q1", True, 10), ("q2", False, 20)]
@@ -0,0 +1,80 @@
+"""
+Tests for streaming JSON helpers.
+"""
+import json
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+from app.utils.streaming import stream_json_list, stream_json_list_response
+
+
+async def _cursor(docs):
+    for doc in docs:
+        yield doc
+
+
+async def _collect(head, docs):
+    chunks = [chunk async for chunk in stream_json_list(head, "items", _cursor(docs), "total")]
+    return json.loads(b"".join(chunks))
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_stream_json_list_empty():
+    """Test an empty cursor still produces a complete document."""
+    assert await _collect({}, []) == {"items": [], "total": 0}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_stream_json_list_mongo_documents():
+    """Test ObjectIds and datetimes are serialized and items counted."""
+    oid = ObjectId()
+    result = await _collect(
+        {"session_id": "abc"},
+        [{"_id": oid, "at": datetime(2024, 1, 1)}, {"_id": "x"}]
+    )
+
+    assert result == {
+        "session_id": "abc",
+        "items": [{"_id": str(oid), "at": "2024-01-01T00:00:00"}, {"_id": "x"}],
+        "total": 2
+    }
+
+
+async def _failing_cursor(docs):
+    for doc in docs:
+        yield doc
+    raise RuntimeError("cursor failed")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_stream_json_list_response_streams_all_documents():
+    """Test the response body is the full document, including the prefetched first item."""
+    response = await stream_json_list_response({}, "items", _cursor([{"a": 1}, {"a": 2}]), "total")
+    body = b"".join([chunk async for chunk in response.body_iterator])
+
+    assert response.media_type == "application/json"
+    assert json.loads(body) == {"items": [{"a": 1}, {"a": 2}], "total": 2}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_stream_json_list_response_raises_before_streaming():
+    """Test a cursor failing on its first batch raises before a response exists."""
+    with pytest.raises(RuntimeError):
+        await stream_json_list_response({}, "items", _failing_cursor([]), "total")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_stream_json_list_response_later_failure_ends_stream():
+    """Test a failure after the first batch can only cut the streamed body short."""
+    response = await stream_json_list_response({}, "items", _failing_cursor([{"a": 1}]), "total")
+
+    with pytest.raises(RuntimeError):
+        async for _ in response.body_iterator:
+            pass
@@ -0,0 +1,44 @@
+"""
+Tests for test session route helpers.
+"""
+import pytest
+
+from app.models.test_session import AnswerStatus, QuestionAnswer, SubmitAnswerRequest, TestConfig
+from app.routes.tests import _answer_body, _config_body, _graded_answer, _unanswered
+
+
+@pytest.mark.unit
+def test_unanswered_matches_question_answer_defaults():
+    """Test the initial answer literal stays in sync with the QuestionAnswer model."""
+    assert _unanswered("q1") == QuestionAnswer(question_id="q1").model_dump()
+
+
+@pytest.mark.unit
+def test_graded_answer_compares_normalized_answers():
+    """Test grading ignores case and surrounding whitespace."""
+    question = {"correct_answer": "Paris", "normalized_answer": "paris"}
+    answer = SubmitAnswerRequest(question_id="q1", user_answer="  PARIS ", time_taken=12)
+
+    graded = _graded_answer(question, answer)
+
+    assert graded["is_correct"] is True
+    assert graded["status"] == AnswerStatus.CORRECT
+    assert graded["time_taken"] == 12
+
+
+@pytest.mark.unit
+def test_answer_body_fills_question_answer_defaults():
+    """Test stored answers missing newer fields are returned as full QuestionAnswer bodies."""
+    stored = {"question_id": "q1", "user_answer": "a", "is_correct": False, "status": "wrong", "extra": 1}
+
+    body = _answer_body(stored)
+
+    assert body == QuestionAnswer(**stored).model_dump()
+
+
+@pytest.mark.unit
+def test_config_body_fills_test_config_defaults():
+    """Test stored configs from before question_types existed get the model defaults."""
+    stored = {"total_questions": 10, "time_per_question": 60, "topics": ["algebra"]}
+
+    assert _config_body(stored) == TestConfig(**stored).model_dump()